@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import time
+
+from timestamps import epoch, record_epoch
+
+# Incremental per-pair aggregates (running max/min/first/last per numeric field).
+#
+# Every persisted tick updates the aggregates in O(1). They are checkpointed to
+# a small sidecar file (<pair>.agg.json) together with the timestamp of the last
+# tick they cover, so a restart only replays the ticks stored after it (through
+# the tick store, whichever backend it is) instead of rescanning the whole
+# history. A rebuild without a sidecar also folds in the 1m/15m rollups of
+# compacted history, using their high/low so the true max/min survive.
+
+TRACKED_FIELDS = ("marketCapUSD", "marketCapSol", "volumeUSD", "numHolders")
+CHECKPOINT_EVERY = 20       # updates between sidecar writes
+CHECKPOINT_SECONDS = 30     # ...or this many seconds, whichever comes first
+
+
+def _empty_state():
+    return {"count": 0, "first_seen": None, "last_seen": None, "fields": {}}
+
+
+def _platform_fields(record):
+    # Older logs stored platform metrics under "axiom"
+    return record.get("platform_data") or record.get("axiom") or {}
+
+
+def _apply(state, record):
+    """Fold one tick, or one rollup in tick form (see compaction.as_record), into `state`."""
+    timestamp = record.get("timestamp")
+    rollup = record.get("rollup") or {}
+    ohlc = rollup.get("ohlc", {})
+    state["count"] += rollup.get("count", 1)
+    if state["first_seen"] is None:
+        state["first_seen"] = timestamp
+    state["last_seen"] = timestamp
+    platform = _platform_fields(record)
+    for field in TRACKED_FIELDS:
+        value = platform.get(field)
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            continue
+        bounds = ohlc.get(field, {})
+        high, low = bounds.get("high", value), bounds.get("low", value)
+        agg = state["fields"].get(field)
+        if agg is None:
+            state["fields"][field] = {
+                "first": bounds.get("open", value), "last": value,
+                "max": high, "max_at": timestamp,
+                "min": low, "min_at": timestamp,
+            }
+            continue
+        agg["last"] = value
+        if high > agg["max"]:
+            agg["max"] = high
+            agg["max_at"] = timestamp
+        if low < agg["min"]:
+            agg["min"] = low
+            agg["min_at"] = timestamp
+
+
+class AggregateEngine:
+    def __init__(self, data_dir, history):
+        """`history(pair, since)` returns the pair's ticks stored at or after `since` (all of them if None),
+        oldest first, with rollups in tick form standing in for the compacted part."""
+        self.data_dir = data_dir
+        self.history = history
+        self._states = {}
+        self._dirty = {}
+        self._last_checkpoint = {}
+        self._lock = threading.Lock()
+
+    def sidecar_path(self, pair):
+        return self.data_dir / f"{pair}.agg.json"
+
+    def _recover(self, pair):
+        """Load the sidecar and replay only the ticks stored after its checkpoint."""
+        state = _empty_state()
+        sidecar = self.sidecar_path(pair)
+        try:
+            if os.path.exists(sidecar):
+                with open(sidecar, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+                state.update({key: saved[key] for key in state if key in saved})
+                epoch(state["last_seen"])  # an unreadable checkpoint time counts as corruption
+        except Exception as e:
+            print(f"❌ Corrupt aggregate sidecar for {pair}, rebuilding: {e}")
+            state = _empty_state()
+
+        replayed = 0
+        for record in self.history(pair, state["last_seen"]):
+            if self._seen(state, record):
+                continue
+            _apply(state, record)
+            replayed += 1
+        if replayed:
+            print(f"📈 Aggregates for {pair}: replayed {replayed} ticks past the checkpoint")
+            self._dirty[pair] = CHECKPOINT_EVERY  # checkpoint on the next update
+        return state
+
+    def get(self, pair):
+        """Current aggregates for `pair` (recovered from disk on first use)."""
+        with self._lock:
+            state = self._states.get(pair)
+            if state is None:
+                state = self._states[pair] = self._recover(pair)
+                self._last_checkpoint[pair] = time.time()
+            return state
+
+    @staticmethod
+    def _seen(state, record):
+        """True if `record` is not newer than the last tick folded into `state`."""
+        last, ts = epoch(state["last_seen"]), record_epoch(record)
+        return last is not None and ts is not None and ts <= last
+
+    def update(self, pair, record):
+        """Fold one persisted record into the aggregates."""
+        state = self.get(pair)
+        with self._lock:
+            if self._seen(state, record):
+                return state  # already replayed from the store during recovery
+            _apply(state, record)
+            self._dirty[pair] = self._dirty.get(pair, 0) + 1
+            due = (
+                self._dirty[pair] >= CHECKPOINT_EVERY
+                or time.time() - self._last_checkpoint.get(pair, 0) >= CHECKPOINT_SECONDS
+            )
+        if due:
+            self.checkpoint(pair)
+        return state
+
+    def checkpoint(self, pair):
+        with self._lock:
+            state = self._states.get(pair)
+            if state is None:
+                return
+            snapshot = json.dumps(state)
+            self._dirty[pair] = 0
+            self._last_checkpoint[pair] = time.time()
+        sidecar = self.sidecar_path(pair)
+        tmp = sidecar.with_name(sidecar.name + ".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(tmp, sidecar)
+        except Exception as e:
+            print(f"❌ Error writing aggregate checkpoint for {pair}: {e}")
+
+    def field(self, pair, field):
+        return self.get(pair)["fields"].get(field, {})
@@ -1,8 +1,9 @@
 # save as axiom_search.py
-import requests
 import json
 import re
 
+import http_client
+
 BASE_URL = "https://api2.axiom.trade/search-v3"
 
 # Put the cookies you showed here. KEEP THESE SECRET in production.
@@ -66,7 +67,7 @@ def axiom_search(search_query: str):
         "onlyBonded": "false",
     }
 
-    resp = requests.get(BASE_URL, params=params, headers=HEADERS, cookies=COOKIES)
+    resp = http_client.get(BASE_URL, params=params, headers=HEADERS, cookies=COOKIES, breaker="axiom")
     resp.raise_for_status()
     data = resp.json()
 
@@ -1,11 +1,11 @@
 import re
 import eventlet
 eventlet.monkey_patch()
+from eventlet import tpool
 
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from flask_socketio import SocketIO
-import requests
+from flask_socketio import SocketIO, join_room, leave_room
 import json
 import os
 import threading
@@ -17,6 +17,25 @@ from io import BytesIO
 import brotli
 import pathlib
 import axiom_search
+import http_client
+from blob_store import BlobStore
+from circuit_breaker import breaker_status
+from column_store import NUMERIC_FIELDS, store_for
+from compaction import MINUTE, QUARTER_HOUR, CompactionJob
+from rate_limiter import x_rate_limiter
+from x_client import x_flight, x_get, x_pool
+from aggregates import AggregateEngine
+from daily_index import DailyIndex
+from data_bus import tick_bus
+from scheduler import AdaptiveScheduler
+from segmented_log import log_for
+from storage import open_store
+from tick_writer import GroupCommitWriter
+from view_cache import ViewCache
+from snapshot_ring import SnapshotRing
+from socket_delta import DeltaEmitter
+from socket_rooms import PANELS, Subscriptions, project, room_name
+from source_cache import SourceCache
 from postwithca import twitter_search_api, parse_twitter_metrics  # Fixed import
 
 # Ensure Windows console supports UTF-8 output
@@ -65,9 +84,68 @@ DATA_DIR.mkdir(exist_ok=True)
 JSON_FILE = DATA_DIR / "pending.json"
 CONFIG_FILE = DATA_DIR / "dashboard_config.json"
 
+# Running ATH/min/first-seen per pair, checkpointed next to each pair log
+pair_aggregates = AggregateEngine(DATA_DIR, lambda pair, since: history_between(pair, start=since))
+
+# Holders lists, X timelines and search authors are persisted once per distinct value
+blob_store = BlobStore(DATA_DIR / "blobs")
+
+# Where ticks are persisted and read back from (STORAGE_BACKEND=jsonl|sqlite)
+tick_store = open_store(DATA_DIR, blob_store)
+
+# Per-day index of (pair, segment, offset) pointers into the pair stores, kept for 7 days
+daily_index = DailyIndex(DATA_DIR / "daily", DATA_DIR)
+
+# Raw ticks older than COMPACT_RAW_HOURS become 1-minute rollups, 1-minute rollups
+# older than COMPACT_1M_DAYS become 15-minute rollups (data/rollups/<pair>/)
+compaction_job = CompactionJob(
+    tick_store,
+    DATA_DIR / "rollups",
+    raw_max_age=float(os.environ.get("COMPACT_RAW_HOURS", "24")) * 3600,
+    minute_max_age=float(os.environ.get("COMPACT_1M_DAYS", "7")) * 86400,
+    # Only pairs that already have columns; opening one here would backfill it
+    columns=lambda pair: columns_for(pair) if (DATA_DIR / "columns" / pair).is_dir() else None,
+)
+
+# Recent snapshots of the current pair kept in memory for the /api routes
+SNAPSHOT_RING_COUNT = 200
+SNAPSHOT_RING_BYTES = 32 * 1024 * 1024
+snapshot_ring = SnapshotRing(SNAPSHOT_RING_COUNT, SNAPSHOT_RING_BYTES)
+
 fetch_interval = 3  # seconds
 search_fetch_interval = 10  # seconds for Twitter search only
-last_search_fetch_time = 0
+
+# Per-tick deadline budget and per-source deadlines inside it (seconds). A source
+# that misses its deadline is served from its last good value (see source_cache)
+# instead of holding back the market-cap update.
+TICK_DEADLINE = 2.5
+SOURCE_DEADLINES = {
+    "platform": 2.5,
+    "x": 2.0,
+    "search": 2.0,
+}
+
+# Polling cadence per data source: (base, min, max[, adaptive]) in seconds.
+# Adaptive cadences tighten while market cap/volume move fast and relax when quiet.
+SOURCE_INTERVALS = {
+    "market": (fetch_interval, fetch_interval, 9),
+    "holders": (15, 6, 60),
+    "pair_info": (60, 60, 300, False),
+    "x": (6, 3, 30),
+    "x_meta": (60, 60, 300, False),
+    "search": (search_fetch_interval, search_fetch_interval, 60),
+}
+
+# Community metadata (fetchOne) and account profiles (UserByScreenName) change slowly:
+# they are refetched on the "x_meta" cadence and reused from here in between
+x_meta_cache = {}
+
+# Which Axiom endpoints each platform cadence refreshes
+AXIOM_ENDPOINT_GROUPS = {
+    "market": ("pair_stats", "token_info"),
+    "holders": ("token_holders", "holder_data"),
+    "pair_info": ("pair_info",),
+}
 
 def _set_json_file_from_pair():
     """Switch JSON_FILE to use the current PAIR_ADDRESS once configured."""
@@ -230,11 +308,12 @@ def fetch_alpha_data():
             "token": PAIR_ADDRESS,
             "language": "en_US"
         }
-        resp = requests.get(
+        resp = http_client.get(
             alpha_endpoints["token_detail"],
             params=token_detail_params,
             headers=alpha_headers,
             cookies=alpha_cookies,
+            breaker="alpha",
             timeout=15
         )
         print(f"[alpha_token_detail] Status {resp.status_code}, Length {len(resp.content)}")
@@ -255,11 +334,12 @@ def fetch_alpha_data():
             "chain": "solana",
             "token": PAIR_ADDRESS
         }
-        resp = requests.get(
+        resp = http_client.get(
             alpha_endpoints["holders_stats"],
             params=holders_params,
             headers=alpha_headers,
             cookies=alpha_cookies,
+            breaker="alpha",
             timeout=15
         )
         print(f"[alpha_holders_stats] Status {resp.status_code}, Length {len(resp.content)}")
@@ -304,7 +384,48 @@ def _axiom_url(base, key="pairAddress", value=None):
     sep = "&" if "?" in base else "?"
     return f"{base}{sep}{key}={value}"
 
-def fetch_axiom_data():
+# Axiom endpoints are fetched concurrently on green threads; a tick costs the
+# slowest call instead of the sum of all of them.
+axiom_fetch_pool = eventlet.GreenPool(size=10)
+
+# Per-endpoint latency, so the slow Axiom host is visible via /api/debug/upstream-timings
+axiom_endpoint_timings = {}
+axiom_fan_out_stats = {"last_ms": 0, "max_ms": 0, "ticks": 0}
+
+# Last good payload per Axiom endpoint, reused for endpoints that are not due this tick
+axiom_last_payloads = {}
+
+def _record_axiom_timing(name, url, elapsed_ms, status):
+    t = axiom_endpoint_timings.setdefault(name, {"host": "", "calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+    t["host"] = url.split("/")[2] if "://" in url else url
+    t["calls"] += 1
+    t["total_ms"] += elapsed_ms
+    t["last_ms"] = round(elapsed_ms, 1)
+    t["max_ms"] = round(max(t["max_ms"], elapsed_ms), 1)
+    t["avg_ms"] = round(t["total_ms"] / t["calls"], 1)
+    t["last_status"] = status
+    if status != 200:
+        t["errors"] += 1
+
+def _fetch_axiom_endpoint(name, url):
+    """Fetch one Axiom endpoint. Returns (name, payload, error); payload is {} on non-200."""
+    started = time.monotonic()
+    status = None
+    try:
+        resp = http_client.get(url, headers=axiom_headers, cookies=axiom_cookies, breaker="axiom", timeout=15)
+        status = resp.status_code
+        return name, (resp.json() if status == 200 else {}), None
+    except Exception as e:
+        print(f"❌ Error fetching Axiom {name}: {e}")
+        return name, {}, e
+    finally:
+        _record_axiom_timing(name, url, (time.monotonic() - started) * 1000, status)
+
+def fetch_axiom_data(groups=None):
+    """Fetch the Axiom endpoints of the given cadence groups (all when None).
+
+    Endpoints that are not fetched, or fail, are filled from their last good payload.
+    """
     data = {}
     # Build URLs lazily using current PAIR_ADDRESS
     endpoints = {
@@ -312,17 +433,32 @@ def fetch_axiom_data():
         "token_info": _axiom_url("https://api9.axiom.trade/token-info", "pairAddress", PAIR_ADDRESS),
         "pair_stats": _axiom_url("https://api9.axiom.trade/pair-stats", "pairAddress", PAIR_ADDRESS),
         "token_holders": _axiom_url("https://api10.axiom.trade/token-info", "pairAddress", PAIR_ADDRESS),
+        "holder_data": f"https://api6.axiom.trade/holder-data-v3?pairAddress={PAIR_ADDRESS}&onlyTrackedWallets=false",
     }
+    if groups is not None:
+        wanted = {name for g in groups for name in AXIOM_ENDPOINT_GROUPS[g]}
+        endpoints = {name: url for name, url in endpoints.items() if name in wanted or name not in axiom_last_payloads}
+
+    started = time.monotonic()
+    pile = eventlet.GreenPile(axiom_fetch_pool)
     for name, url in endpoints.items():
-        try:
-            resp = requests.get(url, headers=axiom_headers, cookies=axiom_cookies, timeout=15)
-            if resp.status_code == 200:
-                data[name] = resp.json()
-            else:
-                data[name] = {}
-        except Exception as e:
-            print(f"❌ Error fetching Axiom {name}: {e}")
-            data[name] = {}
+        pile.spawn(_fetch_axiom_endpoint, name, url)
+    for name, payload, error in pile:
+        if error is None and payload:
+            axiom_last_payloads[name] = payload
+            data[name] = payload
+        elif name in axiom_last_payloads:
+            data[name] = axiom_last_payloads[name]
+        else:
+            # process_axiom_data estimates wallet ages when holder data could not be fetched
+            data[name] = None if (error is not None and name == "holder_data") else payload
+    for name, payload in axiom_last_payloads.items():
+        data.setdefault(name, payload)
+
+    elapsed_ms = (time.monotonic() - started) * 1000
+    axiom_fan_out_stats["ticks"] += 1
+    axiom_fan_out_stats["last_ms"] = round(elapsed_ms, 1)
+    axiom_fan_out_stats["max_ms"] = round(max(axiom_fan_out_stats["max_ms"], elapsed_ms), 1)
     return data
 
 def process_axiom_data(axiom_data):
@@ -333,28 +469,15 @@ def process_axiom_data(axiom_data):
     first_stats = pair_stats[0] if pair_stats else {}
     sol_price_usd = cached_sol_price["price"]
 
-    # Calculate fib levels
-    fib62 = 0
-    fib50 = 0
+    # Fib levels from the pair's all-time high, kept incrementally by the aggregate engine
     min_mc = 5750
-    max_mc = min_mc
-
-    if os.path.exists(JSON_FILE):
-        try:
-            with open(JSON_FILE, "r", encoding="utf-8") as f:
-                max_mc = min_mc
-                for line in f:
-                    try:
-                        entry = json.loads(line)
-                        mc = entry.get("axiom", {}).get("marketCapUSD", 0)
-                        if mc > max_mc:
-                            max_mc = mc
-                    except:
-                        continue
-            fib62 = min_mc + 0.62 * (max_mc - min_mc)
-            fib50 = min_mc + 0.50 * (max_mc - min_mc)
-        except Exception as e:
-            print(f"❌ Error calculating fib levels: {e}")
+    try:
+        max_mc = max(min_mc, pair_aggregates.field(current_pair(), "marketCapUSD").get("max", min_mc))
+    except Exception as e:
+        print(f"❌ Error calculating fib levels: {e}")
+        max_mc = min_mc
+    fib62 = min_mc + 0.62 * (max_mc - min_mc)
+    fib50 = min_mc + 0.50 * (max_mc - min_mc)
 
     # Extract token metrics
     top10_holders_percent = token_holders.get("top10HoldersPercent", 0)
@@ -368,10 +491,10 @@ def process_axiom_data(axiom_data):
     total_holders_count = token_info.get("numHolders", 0)
 
     try:
-        holder_url = f"https://api6.axiom.trade/holder-data-v3?pairAddress={PAIR_ADDRESS}&onlyTrackedWallets=false"
-        holder_resp = requests.get(holder_url, headers=axiom_headers, cookies=axiom_cookies, timeout=15)
-        if holder_resp.status_code == 200:
-            holder_json = holder_resp.json()
+        holder_json = axiom_data.get("holder_data")
+        if holder_json is None:
+            raise ValueError("holder-data-v3 request failed")
+        if holder_json:
             if isinstance(holder_json, dict):
                 holder_json = [holder_json]
             if isinstance(holder_json, list):
@@ -442,12 +565,11 @@ def process_axiom_data(axiom_data):
 # MARKET CAP DROP CHECK
 # -------------------------
 low_mc_start_time = None
-peak_mc_seen = 0
 
 def update_sol_price():
     while True:
         try:
-            response = requests.get(COINGECKO_URL, timeout=10)
+            response = http_client.get(COINGECKO_URL, breaker="coingecko", timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 cached_sol_price["price"] = data['solana']['usd']
@@ -459,7 +581,7 @@ def update_sol_price():
 
 def get_sol_usd_price():
     try:
-        resp = requests.get(COINGECKO_URL, timeout=10)
+        resp = http_client.get(COINGECKO_URL, breaker="coingecko", timeout=10)
         if resp.status_code == 200:
             return resp.json().get("solana", {}).get("usd", 0)
     except Exception as e:
@@ -469,11 +591,14 @@ def get_sol_usd_price():
 # -------------------------
 # X DATA FETCHING
 # -------------------------
-def fetch_x_community_data():
+def fetch_x_community_data(include_meta=True):
     data = {}
     for name, url in x_urls.items():
+        if name == "fetchOne" and not include_meta and x_meta_cache.get("fetchOne"):
+            data[name] = x_meta_cache["fetchOne"]
+            continue
         try:
-            resp = requests.get(url, headers=x_headers, timeout=15)
+            resp = x_get(url, headers=x_headers, timeout=15)
             if resp.status_code == 200:
                 raw = resp.json()
                 if name == "fetchOne":
@@ -494,6 +619,7 @@ def fetch_x_community_data():
                             "bio": legacy.get("description"),
                         },
                     }
+                    x_meta_cache["fetchOne"] = data[name]
                 elif name == "timeline":
                     tweets = []
                     instructions = raw.get("data", {}).get("communityResults", {}).get("result", {}).get("ranked_community_timeline", {}).get("timeline", {}).get("instructions", [])
@@ -529,7 +655,7 @@ def fetch_x_community_data():
             data[name] = {}
     return data
 
-def fetch_x_single_account_data(screen_name_param=None):
+def fetch_x_single_account_data(screen_name_param=None, include_meta=True):
     """Fetch profile and timeline data for a single X account"""
     data = {}
 
@@ -553,43 +679,46 @@ def fetch_x_single_account_data(screen_name_param=None):
         "kdt": "bCVzebeRicfFpAjpz0l2iW5RHQ82C02b3ft88dxy",
         "lang": "en",
         "dnt": "1",
-        "guest_id": "v1:175864037128521710",
-        "auth_token": "84c79d35cb2a902f89168422691d42a685e810cb",
-        "ct0": x_headers.get("x-csrf-token", ""),
-        "twid": "u=1919992237397835776"
+        "guest_id": "v1:175864037128521710"
+        # auth_token, ct0 and twid come from the X account pool (see x_client.x_get)
     }
 
-    # --- Fetch user profile ---
-    try:
-        profile_url = (
-            f"https://x.com/i/api/graphql/96tVxbPqMZDoYB5pmzezKA/UserByScreenName"
-            f"?variables={json.dumps({'screen_name': screen, 'withGrokTranslatedBio': False})}"
-            f"&features={json.dumps({'hidden_profile_subscriptions_enabled': True,'payments_enabled': False,'profile_label_improvements_pcf_label_in_post_enabled': True,'rweb_tipjar_consumption_enabled': True,'verified_phone_label_enabled': True,'subscriptions_verification_info_is_identity_verified_enabled': True,'subscriptions_verification_info_verified_since_enabled': True,'highlights_tweets_tab_ui_enabled': True,'responsive_web_twitter_article_notes_tab_enabled': True,'subscriptions_feature_can_gift_premium': True,'creator_subscriptions_tweet_preview_api_enabled': True,'responsive_web_graphql_skip_user_profile_image_extensions_enabled': False,'responsive_web_graphql_timeline_navigation_enabled': True})}"
-            f"&fieldToggles={json.dumps({'withAuxiliaryUserLabels': True})}"
-        )
-        resp = requests.get(profile_url, headers=x_headers_local, cookies=cookies, timeout=15)
-        print(f"[single_account_profile] Status {resp.status_code}, Length {len(resp.content)}")
-        raw = resp.json()
-        user_result = raw.get("data", {}).get("user", {}).get("result", {})
-        core = user_result.get("core", {})
-        legacy = user_result.get("legacy", {})
-        data["profile"] = {
-            "created_at": core.get("created_at"),
-            "rest_id": user_result.get("rest_id"),
-            "name": core.get("name"),
-            "screen_name": core.get("screen_name"),
-            "favourites_count": legacy.get("favourites_count"),
-            "friends_count": legacy.get("friends_count"),
-            "media_count": legacy.get("media_count"),
-            "followers_count": legacy.get("followers_count"),
-            "statuses_count": legacy.get("statuses_count"),
-            "description": legacy.get("description"),
-            "verified": user_result.get("verification", {}).get("verified", False)
-        }
-        print(f"✅ Fetched profile for {data['profile']['screen_name']}")
-    except Exception as e:
-        print(f"❌ Error fetching/parsing user profile: {e}")
-        data["profile"] = {"error": str(e)}
+    # --- Fetch user profile (or reuse the last one between x_meta refreshes) ---
+    cached_profile = x_meta_cache.get("profile") or {}
+    if not include_meta and cached_profile.get("rest_id") and (cached_profile.get("screen_name") or "").lower() == screen.lower():
+        data["profile"] = cached_profile
+    else:
+        try:
+            profile_url = (
+                f"https://x.com/i/api/graphql/96tVxbPqMZDoYB5pmzezKA/UserByScreenName"
+                f"?variables={json.dumps({'screen_name': screen, 'withGrokTranslatedBio': False})}"
+                f"&features={json.dumps({'hidden_profile_subscriptions_enabled': True,'payments_enabled': False,'profile_label_improvements_pcf_label_in_post_enabled': True,'rweb_tipjar_consumption_enabled': True,'verified_phone_label_enabled': True,'subscriptions_verification_info_is_identity_verified_enabled': True,'subscriptions_verification_info_verified_since_enabled': True,'highlights_tweets_tab_ui_enabled': True,'responsive_web_twitter_article_notes_tab_enabled': True,'subscriptions_feature_can_gift_premium': True,'creator_subscriptions_tweet_preview_api_enabled': True,'responsive_web_graphql_skip_user_profile_image_extensions_enabled': False,'responsive_web_graphql_timeline_navigation_enabled': True})}"
+                f"&fieldToggles={json.dumps({'withAuxiliaryUserLabels': True})}"
+            )
+            resp = x_get(profile_url, headers=x_headers_local, cookies=cookies, timeout=15)
+            print(f"[single_account_profile] Status {resp.status_code}, Length {len(resp.content)}")
+            raw = resp.json()
+            user_result = raw.get("data", {}).get("user", {}).get("result", {})
+            core = user_result.get("core", {})
+            legacy = user_result.get("legacy", {})
+            data["profile"] = {
+                "created_at": core.get("created_at"),
+                "rest_id": user_result.get("rest_id"),
+                "name": core.get("name"),
+                "screen_name": core.get("screen_name"),
+                "favourites_count": legacy.get("favourites_count"),
+                "friends_count": legacy.get("friends_count"),
+                "media_count": legacy.get("media_count"),
+                "followers_count": legacy.get("followers_count"),
+                "statuses_count": legacy.get("statuses_count"),
+                "description": legacy.get("description"),
+                "verified": user_result.get("verification", {}).get("verified", False)
+            }
+            print(f"✅ Fetched profile for {data['profile']['screen_name']}")
+            x_meta_cache["profile"] = data["profile"]
+        except Exception as e:
+            print(f"❌ Error fetching/parsing user profile: {e}")
+            data["profile"] = {"error": str(e)}
 
     # --- Fetch user timeline ---
     try:
@@ -638,7 +767,7 @@ def fetch_x_single_account_data(screen_name_param=None):
         }
         field_toggles = {"withArticlePlainText": False}
 
-        resp = requests.get(
+        resp = x_get(
             timeline_url,
             headers=x_headers_local,
             cookies=cookies,
@@ -753,7 +882,7 @@ def fetch_post_data(tweet_id_param=None):
                 "responsive_web_enhance_cards_enabled": False
             })
         }
-        resp = requests.get(url, headers=x_headers, params=params, timeout=15)
+        resp = x_get(url, headers=x_headers, params=params, timeout=15)
         print(f"[post_data] Status {resp.status_code}, Length {len(resp.content)}")
         if resp.status_code != 200:
             print(f"❌ Post data fetch failed: {resp.status_code} - {resp.text[:200]}")
@@ -801,12 +930,15 @@ def fetch_post_data(tweet_id_param=None):
         data["post"] = {"error": str(e)}
     return data
 
-def fetch_x_data():
-    """Main X data fetcher that routes to appropriate function based on data type"""
+def fetch_x_data(include_meta=True):
+    """Main X data fetcher that routes to appropriate function based on data type.
+
+    Without `include_meta`, community metadata and the account profile are reused from x_meta_cache.
+    """
     if x_data_type == "community":
-        return fetch_x_community_data()
+        return fetch_x_community_data(include_meta)
     elif x_data_type == "single_account":
-        return fetch_x_single_account_data()
+        return fetch_x_single_account_data(include_meta=include_meta)
     elif x_data_type == "post":
         return fetch_post_data()
     else:
@@ -831,7 +963,7 @@ def categorize_wallet_age(funded_at):
     except:
         return "unknown"
 
-def fetch_platform_data():
+def fetch_platform_data(groups=None):
     """Fetch data from the configured platform (Axiom or Alpha.ai)"""
     if not PAIR_ADDRESS:
         print("⛔ Waiting for user contract before fetching...")
@@ -844,16 +976,85 @@ def fetch_platform_data():
         return process_alpha_data(alpha_data)
     else:  # Default to Axiom
         print("🔍 Fetching data from Axiom...")
-        axiom_data = fetch_axiom_data()
+        axiom_data = fetch_axiom_data(groups)
         return process_axiom_data(axiom_data)
 
+def _is_good_x_data(x_data):
+    if not x_data or x_data.get("error"):
+        return False
+    # Sub-fetches that failed or were rate limited come back as {} or {"error": ...}
+    return not any(isinstance(v, dict) and (not v or v.get("error")) for v in x_data.values())
+
+source_caches = {
+    "platform": SourceCache("platform", lambda groups=None: fetch_platform_data(groups)),
+    "x": SourceCache("x", lambda include_meta=True: fetch_x_data(include_meta), is_good=_is_good_x_data),
+    "search": SourceCache("search", lambda: fetch_twitter_search_metrics(), is_good=lambda m: bool(m and m.get("success"))),
+}
+
+tick_scheduler = AdaptiveScheduler(fetch_interval, SOURCE_INTERVALS)
+
+def _read_source(name, fetches, tick_started, default, source_age, stale_sources):
+    """Read one source within what is left of its deadline, recording the value's age.
+
+    Sources that were not due this tick are served from their cache without fetching.
+    """
+    if name not in fetches:
+        value, age = source_caches[name].peek(default)
+        source_age[name] = age
+        return value
+    deadline = min(SOURCE_DEADLINES[name], TICK_DEADLINE)
+    remaining = deadline - (time.monotonic() - tick_started)
+    value, age, fresh = source_caches[name].get(fetches[name], remaining, default)
+    source_age[name] = age
+    if not fresh:
+        stale_sources.append(name)
+    return value
+
 def fetch_all_data():
     """Fetch platform + X data, include twitter search metrics, save and emit result"""
     while True:
         try:
-            platform_data = fetch_platform_data()
-            x_data = fetch_x_data()
-
+            # Stage 1: every due source runs concurrently under its own deadline;
+            # a late source is served stale and keeps refreshing in the background,
+            # a source that is not due is served from its cache
+            tick_started = time.monotonic()
+            source_age = {}
+            stale_sources = []
+
+            due = tick_scheduler.due(tick_started)
+            if not ENABLE_SEARCH_FETCH:
+                due.discard("search")
+            platform_groups = [g for g in AXIOM_ENDPOINT_GROUPS if g in due]
+
+            # Kick off every due source before waiting on any of them
+            fetches = {}
+            fetched = []
+            if platform_groups:
+                fetches["platform"] = source_caches["platform"].refresh(platform_groups)
+                # A fetch still running from an earlier tick only covers the groups it was started with
+                requested = source_caches["platform"].inflight_args[0]
+                fetched += [g for g in platform_groups if g in requested]
+            if "x" in due or "x_meta" in due:
+                fetches["x"] = source_caches["x"].refresh("x_meta" in due)
+                fetched += ["x", "x_meta"] if source_caches["x"].inflight_args[0] else ["x"]
+            if "search" in due:
+                fetches["search"] = source_caches["search"].refresh()
+                fetched.append("search")
+            skipped = sorted(set(SOURCE_INTERVALS) - due)
+            if skipped:
+                print(f"⏭️ Not due this tick: {', '.join(skipped)}")
+
+            platform_data = _read_source("platform", fetches, tick_started, {}, source_age, stale_sources)
+            x_data = _read_source("x", fetches, tick_started, {}, source_age, stale_sources)
+            search_metrics = _read_source("search", fetches, tick_started, {}, source_age, stale_sources) if ENABLE_SEARCH_FETCH else {}
+
+            for name in fetched:
+                tick_scheduler.mark_fetched(name, tick_started)
+            # Only fresh market data says anything about activity; cached values would always read as quiet
+            if "market" in fetched and "platform" not in stale_sources:
+                tick_scheduler.observe(platform_data.get("marketCapUSD"), platform_data.get("volumeUSD"), tick_started)
+
+            # Stage 2: merge
             # Process X data
             unique_authors = set()
             author_followers = []
@@ -910,21 +1111,6 @@ def fetch_all_data():
                         "author_name": item.get("author_name", "")
                     })
 
-            # ADD SEARCH METRICS (respect interval)
-            search_metrics = {}
-            if ENABLE_SEARCH_FETCH:
-                global last_search_fetch_time
-                now = time.time()
-                if now - last_search_fetch_time >= search_fetch_interval:
-                    search_metrics = fetch_twitter_search_metrics()
-                    last_search_fetch_time = now
-                else:
-                    # Skip until interval passes
-                    search_metrics = {}
-                    remaining = int(search_fetch_interval - (now - last_search_fetch_time))
-                    if remaining > 0:
-                        print(f"⏭️ Skipping search fetch, next in {remaining}s")
-
             # Build result
             result = {
                 "timestamp": datetime.now().isoformat(),
@@ -934,26 +1120,13 @@ def fetch_all_data():
                 "x_data": x_data,
                 "unique_authors": len(unique_authors),
                 "author_followers": author_followers,
-                "search_metrics": search_metrics
+                "search_metrics": search_metrics,
+                "source_age": source_age,
+                "stale_sources": stale_sources
             }
 
-            # Persist
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            daily_file = DATA_DIR / f"data_{timestamp[:8]}.json"
-            try:
-                with open(JSON_FILE, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(result, ensure_ascii=False) + "\n")
-                with open(daily_file, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(result, ensure_ascii=False) + "\n")
-            except Exception as e:
-                print(f"❌ Error saving result files: {e}")
-
-            cleanup_old_files()
-
-            try:
-                socketio.emit('data_update', result)
-            except Exception as e:
-                print(f"❌ Error emitting socket update: {e}")
+            # Stage 3: publish once; persistence, emit, exit check and view stats all subscribe
+            tick_bus.publish("tick", result)
 
             print(f"✅ Emitted and saved data at {result['timestamp']}")
             print(f"📊 X Data Type: {x_data_type}")
@@ -968,20 +1141,24 @@ def fetch_all_data():
             traceback.print_exc()
             time.sleep(5)
 
-def fetch_all_viewData():
-    x_data_local = fetch_x_data()
+def fetch_all_viewData(result=None):
+    """Total views and unique authors for a tick, read from the data bus (no X refetch)."""
+    if result is None:
+        result = tick_bus.latest("tick", {})
+    x_data_local = result.get("x_data", {}) or {}
+    tick_x_data_type = result.get("x_data_type")
     total_views = 0
     unique_authors = set()
 
     timeline_data = []
-    if x_data_type == "community":
+    if tick_x_data_type == "community":
         timeline_data = x_data_local.get("timeline", [])
-    elif x_data_type == "single_account":
+    elif tick_x_data_type == "single_account":
         timeline_data = x_data_local.get("timeline", [])
         profile = x_data_local.get("profile", {})
         if profile and not profile.get("error"):
             unique_authors.add(profile.get("screen_name", ""))
-    elif x_data_type == "post":
+    elif tick_x_data_type == "post":
         post = x_data_local.get("post", {})
         if post and not post.get("error"):
             author = post.get("user", {}).get("screen_name", "")
@@ -1019,9 +1196,8 @@ def fetch_all_viewData():
     }
 
 def check_exit_condition(curr_mc):
-    global low_mc_start_time, peak_mc_seen
-    if curr_mc > peak_mc_seen:
-        peak_mc_seen = curr_mc
+    global low_mc_start_time
+    peak_mc_seen = max(pair_aggregates.field(current_pair(), "marketCapUSD").get("max", 0), curr_mc)
     cond1 = curr_mc < 6500
     cond2 = (peak_mc_seen > 0 and curr_mc < 0.1 * peak_mc_seen)
     if cond1 or cond2:
@@ -1036,25 +1212,146 @@ def check_exit_condition(curr_mc):
     else:
         low_mc_start_time = None
 
+# -------------------------
+# TICK SUBSCRIBERS
+# -------------------------
+def _fsync(f):
+    f.flush()
+    # fsync can stall for a long time; run it on a native thread so the hub keeps serving
+    tpool.execute(os.fsync, f.fileno())
+
+def _persist_batch(batch, sync):
+    """Group-commit handler: serialize each tick once, write it to its pair store and index it by day.
+
+    Returns how many ticks could not be stored.
+    """
+    by_pair = {}
+    sizes = {}
+    daily_entries = []
+    failed = 0
+    for pair, record in batch:
+        text, size = tick_store.encode(record)
+        by_pair.setdefault(pair, []).append((record, text))
+        sizes.setdefault(pair, []).append(size)
+
+    for pair, items in by_pair.items():
+        # Open (and backfill) the column store before these ticks reach storage, or they would be loaded twice
+        columns = columns_for(pair)
+        try:
+            locations = tick_store.append_batch(pair, items, _fsync if sync else None)
+        except Exception as e:
+            print(f"❌ Error saving ticks: {e}")
+            failed += len(items)
+            continue
+        if pair == current_pair():
+            # Only ticks that reached storage enter the ring; it holds the full record, so count its
+            # full size (as warm() does), not the deduplicated row
+            ring = current_snapshots()
+            for (record, _), size in zip(items, sizes[pair]):
+                ring.append(record, size)
+        for (record, _), location in zip(items, locations):
+            columns.append(record)
+            pair_aggregates.update(pair, record)
+            daily_entries.append((pair, location, record.get("timestamp") or datetime.now().isoformat()))
+
+    try:
+        daily_index.append(daily_entries, _fsync if sync else None)
+    except Exception as e:
+        print(f"❌ Error updating daily index: {e}")
+
+    cleanup_old_files()
+    return failed
+
+# Persistence runs on its own group-commit writer so the socket emit never waits on disk.
+# TICK_FSYNC=none|interval|always
+tick_writer = GroupCommitWriter(_persist_batch, fsync_policy=os.environ.get("TICK_FSYNC", "interval"))
+
+def persist_tick(result):
+    tick_writer.submit((current_pair(), result))
+
+# Socket clients subscribe to "<pair>:<panel>" rooms (see socket_rooms); each room gets a keyframe
+# on subscribe, then per-tick deltas against it (see socket_delta)
+socket_updates = DeltaEmitter(lambda event, payload, to=None: socketio.emit(event, payload, to=to))
+socket_subscriptions = Subscriptions()
+
+def emit_tick(result):
+    pair = current_pair()
+    for panel in PANELS:
+        room = room_name(pair, panel)
+        if not socket_subscriptions.subscribers(room):
+            continue
+        try:
+            socket_updates.publish(room, project(result, panel), to=room)
+        except Exception as e:
+            print(f"❌ Error emitting socket update to {room}: {e}")
+
+def _requested_rooms(data):
+    """Rooms named by a {"pair", "panels"} socket message; pair defaults to the current one, panels to all."""
+    data = data or {}
+    pair = data.get("pair") or current_pair()
+    panels = data.get("panels") or list(PANELS)
+    if isinstance(panels, str):
+        panels = [panels]
+    return [room_name(pair, panel) for panel in panels if panel in PANELS]
+
+@socketio.on("subscribe")
+def on_socket_subscribe(data=None):
+    """Join pair/panel rooms: {"pair": ..., "panels": ["price", "holders", "social", "search"]}."""
+    rooms = _requested_rooms(data)
+    for room in rooms:
+        join_room(room)
+    socket_subscriptions.add(request.sid, rooms)
+    for room in rooms:
+        socket_updates.resync(room, request.sid)
+    return {"rooms": socket_subscriptions.rooms_of(request.sid)}
+
+@socketio.on("unsubscribe")
+def on_socket_unsubscribe(data=None):
+    rooms = socket_subscriptions.remove(request.sid, _requested_rooms(data))
+    for room in rooms:
+        leave_room(room)
+    return {"rooms": socket_subscriptions.rooms_of(request.sid)}
+
+@socketio.on("disconnect")
+def on_socket_disconnect(*args):
+    socket_subscriptions.remove(request.sid)
+
+@socketio.on("resync")
+def on_socket_resync(data=None):
+    """A client that missed a delta asks for the full state again: {"channel": room} or every room it joined."""
+    channel = (data or {}).get("channel")
+    for room in [channel] if channel else socket_subscriptions.rooms_of(request.sid):
+        socket_updates.resync(room, request.sid)
+
+def check_exit_on_tick(result):
+    if result and "platform_data" in result:
+        curr_mc = result["platform_data"].get("marketCapUSD", 0) or 0
+        check_exit_condition(curr_mc)
+
+def log_view_stats(result):
+    view_stats = fetch_all_viewData(result)
+    print(f"📊 Timeline Stats → Views: {view_stats['total_views']} | Unique Authors: {view_stats['unique_authors']}")
+
+tick_bus.subscribe("tick", emit_tick)
+tick_bus.subscribe("tick", persist_tick)
+tick_bus.subscribe("tick", check_exit_on_tick)
+tick_bus.subscribe("tick", log_view_stats)
+
 def background_fetcher():
+    # Ticks sit on a fixed grid, so a slow fetch does not push every later tick back
     while True:
+        tick_scheduler.begin_tick()
         try:
-            result = fetch_all_data()
-            if result and "platform_data" in result:
-                curr_mc = result["platform_data"].get("marketCapUSD", 0) or 0
-                check_exit_condition(curr_mc)
-            view_stats = fetch_all_viewData()
-            print(f"📊 Timeline Stats → Views: {view_stats['total_views']} | Unique Authors: {view_stats['unique_authors']}")
+            fetch_all_data()
         except Exception as e:
             print(f"❌ Error in background_fetcher: {e}")
-        time.sleep(fetch_interval)
+        time.sleep(tick_scheduler.end_tick())
 
 # -------------------------
 # API ROUTES
 # -------------------------
-@app.route("/api/x-data")
-def get_x_data():
-    return jsonify({
+def _x_data_view():
+    return {
         "success": True,
         "pair_address": PAIR_ADDRESS,
         "x_data_type": x_data_type,
@@ -1062,7 +1359,11 @@ def get_x_data():
         "community_id": community_id,
         "screen_name": screen_name,
         "tweet_id": tweet_id
-    })
+    }
+
+@app.route("/api/x-data")
+def get_x_data():
+    return jsonify(_x_data_view())
 
 @app.route("/api/debug/search-test")
 def debug_search_test():
@@ -1095,41 +1396,37 @@ def debug_search_test():
             "endpoint": getattr(twitter_search_api, "base_url", "unknown")
         }), 500
 
+def _marketcap_view():
+    history_data = []
+    times, cols = current_columns().window(("marketCapUSD", "marketCapSol", "volumeUSD", "supply"), last=100)
+    for i, ts in enumerate(times.tolist()):
+        timestamp = datetime.fromtimestamp(ts / 1_000_000)
+        mc_sol = _column_value(cols["marketCapSol"][i])
+        supply = _column_value(cols["supply"][i])
+        history_data.append({
+            "timestamp": timestamp.isoformat(),
+            "time": timestamp.strftime("%H:%M"),
+            "marketCapUSD": _column_value(cols["marketCapUSD"][i]),
+            "marketCapSol": mc_sol,
+            "volumeUSD": _column_value(cols["volumeUSD"][i]),
+            "priceSol": mc_sol / supply if supply else 0
+        })
+
+    latest = get_latest_data()
+    current_mc = latest.get("platform_data", {}).get("marketCapUSD", 0)
+    return {
+        "current": {
+            "marketCapUSD": current_mc,
+            "marketCapSol": latest.get("platform_data", {}).get("marketCapSol", 0),
+            "volumeUSD": latest.get("platform_data", {}).get("volumeUSD", 0),
+            "lastUpdated": latest.get("timestamp", "")
+        },
+        "history": history_data
+    }
+
 @app.route("/api/marketcap")
 def marketcap_data():
-    try:
-        history_data = []
-        if os.path.exists(JSON_FILE):
-            with open(JSON_FILE, "r", encoding="utf-8") as f:
-                lines = f.readlines()[-100:]
-                for line in lines:
-                    try:
-                        data = json.loads(line)
-                        timestamp = datetime.fromisoformat(data["timestamp"])
-                        history_data.append({
-                            "timestamp": timestamp.isoformat(),
-                            "time": timestamp.strftime("%H:%M"),
-                            "marketCapUSD": data.get("platform_data", {}).get("marketCapUSD", 0),
-                            "marketCapSol": data.get("platform_data", {}).get("marketCapSol", 0),
-                            "volumeUSD": data.get("platform_data", {}).get("volumeUSD", 0),
-                            "priceSol": data.get("platform_data", {}).get("marketCapSol", 0) / data.get("platform_data", {}).get("supply", 1) if data.get("platform_data", {}).get("supply") else 0
-                        })
-                    except Exception:
-                        continue
-
-        latest = get_latest_data()
-        current_mc = latest.get("platform_data", {}).get("marketCapUSD", 0)
-        return jsonify({
-            "current": {
-                "marketCapUSD": current_mc,
-                "marketCapSol": latest.get("platform_data", {}).get("marketCapSol", 0),
-                "volumeUSD": latest.get("platform_data", {}).get("volumeUSD", 0),
-                "lastUpdated": latest.get("timestamp", "")
-            },
-            "history": history_data
-        })
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return serve_view("marketcap", _marketcap_view)
 
 @app.route("/api/debug/post-data")
 def debug_post_data():
@@ -1157,215 +1454,299 @@ def debug_search_data():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/debug/connections")
+def debug_connections():
+    """Keep-alive reuse per upstream host, plus how many identical in-flight requests were coalesced."""
+    return jsonify({
+        "hosts": http_client.connection_stats(),
+        "singleflight": {
+            "http": http_client.get_flight.stats(),
+            "x": x_flight.stats()
+        }
+    })
+
+@app.route("/api/debug/breakers")
+def debug_breakers():
+    """Circuit breaker state per upstream family, so operators can see which upstream is down."""
+    return jsonify(breaker_status())
+
+@app.route("/api/debug/rate-limits")
+def debug_rate_limits():
+    """Token-bucket state per X account and GraphQL operation, plus account health."""
+    return jsonify({
+        "buckets": x_rate_limiter.status(),
+        "accounts": x_pool.status()
+    })
+
+@app.route("/api/debug/schedule")
+def debug_schedule():
+    """Per-source polling cadence, activity factor and late/missed tick counts."""
+    return jsonify(tick_scheduler.status())
+
+@app.route("/api/debug/upstream-timings")
+def debug_upstream_timings():
+    """Per-endpoint Axiom latency and the wall time of the concurrent fan-out."""
+    return jsonify({
+        "axiom_fan_out": axiom_fan_out_stats,
+        "axiom_endpoints": axiom_endpoint_timings,
+        "sources": {name: cache.status() for name, cache in source_caches.items()}
+    })
+
+@app.route("/api/debug/writer")
+def debug_writer():
+    """Queue depth, batch sizes, fsyncs and write latency of the tick writer."""
+    return jsonify(tick_writer.status())
+
+@app.route("/api/debug/socket")
+def debug_socket():
+    """Room subscriptions and keyframe/delta counts and average sizes of the Socket.IO updates."""
+    return jsonify({**socket_updates.status(), "subscriptions": socket_subscriptions.status()})
+
+@app.route("/api/debug/compaction")
+def debug_compaction():
+    """Runs, compacted tick and promoted bucket counts of the retention job."""
+    return jsonify(compaction_job.status())
+
+@app.route("/api/debug/snapshots")
+def debug_snapshots():
+    """Occupancy and hit rate of the in-memory snapshot ring, cached views, blob dedup counters and storage backend."""
+    status = {**snapshot_ring.status(), "views": view_cache.status(), "blobs": blob_store.status(), "storage": tick_store.status()}
+    if tick_store.name == "jsonl":
+        status["log"] = log_for(DATA_DIR, current_pair()).status()
+    return jsonify(status)
+
+def _tokeninfo_view():
+    latest = get_latest_data()
+    p = latest.get("platform_data", {})
+    return {
+        "tokenAddress": p.get("tokenAddress"),
+        "tokenName": p.get("tokenName"),
+        "tokenTicker": p.get("tokenTicker"),
+        "twitter": p.get("twitter"),
+        "tokenImage": p.get("tokenImage"),
+        "createdAt": p.get("createdAt"),
+        "bndpercentage": p.get("bundlersHoldPercent"),
+        "top10": p.get("top10HoldersPercent"),
+        "insidersHoldPercent": p.get("insidersHoldPercent"),
+        "snipersHoldPercent": p.get("snipersHoldPercent"),
+        "dexPaid": p.get("dexPaid")
+    }
+
 @app.route("/api/tokeninfo")
 def token_info_data():
+    return serve_view("tokeninfo", _tokeninfo_view)
+
+@app.route("/api/series")
+def series_data():
+    """Numeric platform_data columns over a time range, e.g. ?fields=marketCapUSD,volumeUSD&from=...&to=...&last=500.
+
+    `from`/`to` accept ISO timestamps or epoch seconds.
+    """
     try:
-        latest = get_latest_data()
-        p = latest.get("platform_data", {})
+        fields = [f for f in request.args.get("fields", "marketCapUSD").split(",") if f]
+        unknown = [f for f in fields if f not in NUMERIC_FIELDS]
+        if unknown:
+            return jsonify({"error": f"Unknown fields: {', '.join(unknown)}", "fields": list(NUMERIC_FIELDS)}), 400
+
+        def parse_time(value):
+            if not value:
+                return None
+            try:
+                return float(value)
+            except ValueError:
+                return datetime.fromisoformat(value)
+
+        last = request.args.get("last", type=int)
+        times, cols = current_columns().window(
+            fields, parse_time(request.args.get("from")), parse_time(request.args.get("to")), last or 500
+        )
         return jsonify({
-            "tokenAddress": p.get("tokenAddress"),
-            "tokenName": p.get("tokenName"),
-            "tokenTicker": p.get("tokenTicker"),
-            "twitter": p.get("twitter"),
-            "tokenImage": p.get("tokenImage"),
-            "createdAt": p.get("createdAt"),
-            "bndpercentage": p.get("bundlersHoldPercent"),
-            "top10": p.get("top10HoldersPercent"),
-            "insidersHoldPercent": p.get("insidersHoldPercent"),
-            "snipersHoldPercent": p.get("snipersHoldPercent"),
-            "dexPaid": p.get("dexPaid")
+            "timestamps": [datetime.fromtimestamp(ts / 1_000_000).isoformat() for ts in times.tolist()],
+            **{f: [_column_value(v, None) for v in cols[f].tolist()] for f in fields}
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def _buys_sells_view():
+    history_data = []
+    for data in recent_records(50):
+        try:
+            timestamp = datetime.fromisoformat(data["timestamp"])
+            history_data.append({
+                "timestamp": timestamp.isoformat(),
+                "time": timestamp.strftime("%H:%M"),
+                "buyVolume": data.get("platform_data", {}).get("buyVolumeUSD", 0),
+                "sellVolume": data.get("platform_data", {}).get("sellVolumeUSD", 0),
+                "netVolume": data.get("platform_data", {}).get("volumeUSD", 0),
+                "buyCount": data.get("platform_data", {}).get("buyCount", 0),
+                "sellCount": data.get("platform_data", {}).get("sellCount", 0)
+            })
+        except Exception:
+            continue
+
+    latest = get_latest_data()
+    return {
+        "current": {
+            "buyVolume": latest.get("platform_data", {}).get("buyVolumeUSD", 0),
+            "sellVolume": latest.get("platform_data", {}).get("sellVolumeUSD", 0),
+            "netVolume": latest.get("platform_data", {}).get("volumeUSD", 0),
+            "buyCount": latest.get("platform_data", {}).get("buyCount", 0),
+            "sellCount": latest.get("platform_data", {}).get("sellCount", 0),
+            "lastUpdated": latest.get("timestamp", "")
+        },
+        "history": history_data
+    }
+
 @app.route("/api/buys-sells")
 def buys_sells_data():
-    try:
-        history_data = []
-        if os.path.exists(JSON_FILE):
-            with open(JSON_FILE, "r", encoding="utf-8") as f:
-                lines = f.readlines()[-50:]
-                for line in lines:
-                    try:
-                        data = json.loads(line)
-                        timestamp = datetime.fromisoformat(data["timestamp"])
-                        history_data.append({
-                            "timestamp": timestamp.isoformat(),
-                            "time": timestamp.strftime("%H:%M"),
-                            "buyVolume": data.get("platform_data", {}).get("buyVolumeUSD", 0),
-                            "sellVolume": data.get("platform_data", {}).get("sellVolumeUSD", 0),
-                            "netVolume": data.get("platform_data", {}).get("volumeUSD", 0),
-                            "buyCount": data.get("platform_data", {}).get("buyCount", 0),
-                            "sellCount": data.get("platform_data", {}).get("sellCount", 0)
-                        })
-                    except Exception:
-                        continue
+    return serve_view("buys-sells", _buys_sells_view)
 
-        latest = get_latest_data()
-        return jsonify({
-            "current": {
-                "buyVolume": latest.get("platform_data", {}).get("buyVolumeUSD", 0),
-                "sellVolume": latest.get("platform_data", {}).get("sellVolumeUSD", 0),
-                "netVolume": latest.get("platform_data", {}).get("volumeUSD", 0),
-                "buyCount": latest.get("platform_data", {}).get("buyCount", 0),
-                "sellCount": latest.get("platform_data", {}).get("sellCount", 0),
-                "lastUpdated": latest.get("timestamp", "")
-            },
-            "history": history_data
-        })
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+def _wallet_age_view():
+    latest = get_latest_data()
+    wallet_age = latest.get("platform_data", {}).get("walletAgeCounts", {})
+    holders_data = latest.get("platform_data", {}).get("holders", [])
+    return {
+        "distribution": wallet_age,
+        "totalHolders": latest.get("platform_data", {}).get("totalHolders", 0),
+        "holders": holders_data[:50],
+        "lastUpdated": latest.get("timestamp", "")
+    }
 
 @app.route("/api/wallet-age")
 def wallet_age_data():
-    try:
-        latest = get_latest_data()
-        wallet_age = latest.get("platform_data", {}).get("walletAgeCounts", {})
-        holders_data = latest.get("platform_data", {}).get("holders", [])
-        return jsonify({
-            "distribution": wallet_age,
-            "totalHolders": latest.get("platform_data", {}).get("totalHolders", 0),
-            "holders": holders_data[:50],
+    return serve_view("wallet-age", _wallet_age_view)
+
+def _social_view():
+    history_data = []
+    for data in recent_records(50):
+        try:
+            timestamp = datetime.fromisoformat(data["timestamp"])
+            x_data_local = data.get("x_data", {})
+            timeline_data = []
+            if data.get("x_data_type") == "community":
+                timeline_data = x_data_local.get("timeline", [])
+            elif data.get("x_data_type") == "single_account":
+                timeline_data = x_data_local.get("timeline", [])
+            elif data.get("x_data_type") == "post":
+                post = x_data_local.get("post", {})
+                if post and not post.get("error"):
+                    timeline_data = [post]
+            total_views = sum(int(t.get("views", 0) or t.get("views_count", 0)) for t in timeline_data if isinstance(t.get("views"), (int, float)))
+            total_likes = sum(t.get("favorite_count", 0) for t in timeline_data)
+            total_retweets = sum(t.get("retweet_count", 0) for t in timeline_data)
+            total_replies = sum(t.get("reply_count", 0) for t in timeline_data)
+            total_quotes = sum(t.get("quote_count", 0) for t in timeline_data)
+            total_bookmarks = sum(t.get("bookmark_count", 0) for t in timeline_data)
+            history_data.append({
+                "timestamp": timestamp.isoformat(),
+                "time": timestamp.strftime("%H:%M"),
+                "views": total_views,
+                "likes": total_likes,
+                "retweets": total_retweets,
+                "replies": total_replies,
+                "quotes": total_quotes,
+                "bookmarks": total_bookmarks,
+                "uniqueAuthors": data.get("unique_authors", 0)
+            })
+        except Exception:
+            continue
+
+    latest = get_latest_data()
+    x_data_local = latest.get("x_data", {})
+    timeline_data = []
+    if latest.get("x_data_type") == "community":
+        timeline_data = x_data_local.get("timeline", [])
+    elif latest.get("x_data_type") == "single_account":
+        timeline_data = x_data_local.get("timeline", [])
+    elif latest.get("x_data_type") == "post":
+        post = x_data_local.get("post", {})
+        if post and not post.get("error"):
+            timeline_data = [post]
+
+    current_views = sum(int(t.get("views", 0) or t.get("views_count", 0)) for t in timeline_data if t.get("views") or t.get("views_count"))
+    current_likes = sum(t.get("favorite_count", 0) for t in timeline_data)
+    current_retweets = sum(t.get("retweet_count", 0) for t in timeline_data)
+    current_replies = sum(t.get("reply_count", 0) for t in timeline_data)
+    current_quotes = sum(t.get("quote_count", 0) for t in timeline_data)
+    current_bookmarks = sum(t.get("bookmark_count", 0) for t in timeline_data)
+
+    member_count = 0
+    if latest.get("x_data_type") == "community":
+        member_count = x_data_local.get("fetchOne", {}).get("member_count", 0)
+    elif latest.get("x_data_type") == "single_account":
+        profile = x_data_local.get("profile", {})
+        if profile and not profile.get("error"):
+            member_count = profile.get("followers_count", 0)
+    elif latest.get("x_data_type") == "post":
+        post = x_data_local.get("post", {})
+        if post and not post.get("error"):
+            member_count = post.get("user", {}).get("followers_count", 0)
+
+    search_metrics = latest.get("search_metrics", {})
+    response_data = {
+        "current": {
+            "views": current_views,
+            "likes": current_likes,
+            "retweets": current_retweets,
+            "replies": current_replies,
+            "quotes": current_quotes,
+            "bookmarks": current_bookmarks,
+            "uniqueAuthors": latest.get("unique_authors", 0),
+            "memberCount": member_count,
             "lastUpdated": latest.get("timestamp", "")
-        })
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        },
+        "history": history_data
+    }
+    if search_metrics:
+        response_data["search_metrics"] = {
+            "total_likes": search_metrics.get("total_likes", 0),
+            "total_retweets": search_metrics.get("total_retweets", 0),
+            "total_replies": search_metrics.get("total_replies", 0),
+            "total_quotes": search_metrics.get("total_quotes", 0),
+            "total_bookmarks": search_metrics.get("total_bookmarks", 0),
+            "total_views": search_metrics.get("total_views", 0),
+            "total_tweets": search_metrics.get("total_tweets", 0),
+            "unique_authors_count": search_metrics.get("unique_authors_count", 0),
+            "unique_authors": search_metrics.get("unique_authors", {}),
+            "success": search_metrics.get("success", False)
+        }
+    return response_data
 
 @app.route("/api/social")
 def social_data():
-    try:
-        history_data = []
-        if os.path.exists(JSON_FILE):
-            with open(JSON_FILE, "r", encoding="utf-8") as f:
-                lines = f.readlines()[-50:]
-                for line in lines:
-                    try:
-                        data = json.loads(line)
-                        timestamp = datetime.fromisoformat(data["timestamp"])
-                        x_data_local = data.get("x_data", {})
-                        timeline_data = []
-                        if data.get("x_data_type") == "community":
-                            timeline_data = x_data_local.get("timeline", [])
-                        elif data.get("x_data_type") == "single_account":
-                            timeline_data = x_data_local.get("timeline", [])
-                        elif data.get("x_data_type") == "post":
-                            post = x_data_local.get("post", {})
-                            if post and not post.get("error"):
-                                timeline_data = [post]
-                        total_views = sum(int(t.get("views", 0) or t.get("views_count", 0)) for t in timeline_data if isinstance(t.get("views"), (int, float)))
-                        total_likes = sum(t.get("favorite_count", 0) for t in timeline_data)
-                        total_retweets = sum(t.get("retweet_count", 0) for t in timeline_data)
-                        total_replies = sum(t.get("reply_count", 0) for t in timeline_data)
-                        total_quotes = sum(t.get("quote_count", 0) for t in timeline_data)
-                        total_bookmarks = sum(t.get("bookmark_count", 0) for t in timeline_data)
-                        history_data.append({
-                            "timestamp": timestamp.isoformat(),
-                            "time": timestamp.strftime("%H:%M"),
-                            "views": total_views,
-                            "likes": total_likes,
-                            "retweets": total_retweets,
-                            "replies": total_replies,
-                            "quotes": total_quotes,
-                            "bookmarks": total_bookmarks,
-                            "uniqueAuthors": data.get("unique_authors", 0)
-                        })
-                    except Exception:
-                        continue
-
-        latest = get_latest_data()
-        x_data_local = latest.get("x_data", {})
-        timeline_data = []
-        if latest.get("x_data_type") == "community":
-            timeline_data = x_data_local.get("timeline", [])
-        elif latest.get("x_data_type") == "single_account":
-            timeline_data = x_data_local.get("timeline", [])
-        elif latest.get("x_data_type") == "post":
-            post = x_data_local.get("post", {})
-            if post and not post.get("error"):
-                timeline_data = [post]
-
-        current_views = sum(int(t.get("views", 0) or t.get("views_count", 0)) for t in timeline_data if t.get("views") or t.get("views_count"))
-        current_likes = sum(t.get("favorite_count", 0) for t in timeline_data)
-        current_retweets = sum(t.get("retweet_count", 0) for t in timeline_data)
-        current_replies = sum(t.get("reply_count", 0) for t in timeline_data)
-        current_quotes = sum(t.get("quote_count", 0) for t in timeline_data)
-        current_bookmarks = sum(t.get("bookmark_count", 0) for t in timeline_data)
-
-        member_count = 0
-        if latest.get("x_data_type") == "community":
-            member_count = x_data_local.get("fetchOne", {}).get("member_count", 0)
-        elif latest.get("x_data_type") == "single_account":
-            profile = x_data_local.get("profile", {})
-            if profile and not profile.get("error"):
-                member_count = profile.get("followers_count", 0)
-        elif latest.get("x_data_type") == "post":
-            post = x_data_local.get("post", {})
-            if post and not post.get("error"):
-                member_count = post.get("user", {}).get("followers_count", 0)
-
-        search_metrics = latest.get("search_metrics", {})
-        response_data = {
-            "current": {
-                "views": current_views,
-                "likes": current_likes,
-                "retweets": current_retweets,
-                "replies": current_replies,
-                "quotes": current_quotes,
-                "bookmarks": current_bookmarks,
-                "uniqueAuthors": latest.get("unique_authors", 0),
-                "memberCount": member_count,
-                "lastUpdated": latest.get("timestamp", "")
-            },
-            "history": history_data
+    return serve_view("social", _social_view)
+
+def _twitter_search_view():
+    latest = get_latest_data()
+    search_metrics = latest.get("search_metrics", {})
+    if not search_metrics:
+        return {
+            "total_posts_count": 0,
+            "total_media_posts_count": 0,
+            "total_normal_posts_count": 0,
+            "unique_authors_count": 0,
+            "unique_authors": {},
+            "success": False
         }
-        if search_metrics:
-            response_data["search_metrics"] = {
-                "total_likes": search_metrics.get("total_likes", 0),
-                "total_retweets": search_metrics.get("total_retweets", 0),
-                "total_replies": search_metrics.get("total_replies", 0),
-                "total_quotes": search_metrics.get("total_quotes", 0),
-                "total_bookmarks": search_metrics.get("total_bookmarks", 0),
-                "total_views": search_metrics.get("total_views", 0),
-                "total_tweets": search_metrics.get("total_tweets", 0),
-                "unique_authors_count": search_metrics.get("unique_authors_count", 0),
-                "unique_authors": search_metrics.get("unique_authors", {}),
-                "success": search_metrics.get("success", False)
+    return {
+        "total_posts_count": search_metrics.get("total_posts_count", 0),
+        "total_media_posts_count": search_metrics.get("total_media_posts_count", 0),
+        "total_normal_posts_count": search_metrics.get("total_normal_posts_count", 0),
+        "unique_authors_count": search_metrics.get("unique_authors_count", 0),
+        "unique_authors": {
+            username: {
+                "name": author_data.get("name", ""),
+                "followers_count": author_data.get("followers_count", 0)
             }
-        return jsonify(response_data)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+            for username, author_data in (search_metrics.get("unique_authors") or {}).items()
+            if isinstance(author_data, dict)
+        },
+        "success": search_metrics.get("success", False)
+    }
 
 @app.route("/api/twitter-search")
 def twitter_search():
-    try:
-        latest = get_latest_data()
-        search_metrics = latest.get("search_metrics", {})
-        if not search_metrics:
-            return jsonify({
-                "total_posts_count": 0,
-                "total_media_posts_count": 0,
-                "total_normal_posts_count": 0,
-                "unique_authors_count": 0,
-                "unique_authors": {},
-                "success": False
-            })
-        return jsonify({
-            "total_posts_count": search_metrics.get("total_posts_count", 0),
-            "total_media_posts_count": search_metrics.get("total_media_posts_count", 0),
-            "total_normal_posts_count": search_metrics.get("total_normal_posts_count", 0),
-            "unique_authors_count": search_metrics.get("unique_authors_count", 0),
-            "unique_authors": {
-                username: {
-                    "name": author_data.get("name", ""),
-                    "followers_count": author_data.get("followers_count", 0)
-                }
-                for username, author_data in search_metrics.get("unique_authors", {}).items()
-            },
-            "success": search_metrics.get("success", False)
-        })
-    except Exception as e:
-        print(f"❌ Error in Twitter search endpoint: {e}")
-        return jsonify({"error": str(e)}), 500
+    return serve_view("twitter-search", _twitter_search_view)
 
 @app.route("/api/toggle-search", methods=["POST"])
 def toggle_search():
@@ -1374,139 +1755,251 @@ def toggle_search():
     ENABLE_SEARCH_FETCH = data.get("enabled", True)
     return jsonify({"enabled": ENABLE_SEARCH_FETCH})
 
+def _metrics_view():
+    latest = get_latest_data()
+    p = latest.get("platform_data", {})
+    x_local = latest.get("x_data", {})
+    member_count = 0
+    if latest.get("x_data_type") == "community":
+        member_count = x_local.get("fetchOne", {}).get("member_count", 0)
+    elif latest.get("x_data_type") == "single_account":
+        profile = x_local.get("profile", {})
+        if profile and not profile.get("error"):
+            member_count = profile.get("followers_count", 0)
+    elif latest.get("x_data_type") == "post":
+        post = x_local.get("post", {})
+        if post and not post.get("error"):
+            member_count = post.get("user", {}).get("followers_count", 0)
+    return {
+        "marketCapUSD": p.get("marketCapUSD", 0),
+        "volumeUSD": p.get("volumeUSD", 0),
+        "holders": p.get("numHolders", 0),
+        "liquidityUSD": p.get("initialLiquiditySol", 0) * cached_sol_price["price"] if p.get("initialLiquiditySol") else 0,
+        "uniqueAuthors": latest.get("unique_authors", 0),
+        "memberCount": member_count,
+        "solPrice": p.get("solPriceUSD", 0),
+        "lastUpdated": latest.get("timestamp", "")
+    }
+
 @app.route("/api/metrics")
 def metrics_data():
+    return serve_view("metrics", _metrics_view)
+
+def current_snapshots():
+    """Snapshot ring for the current pair, pre-warmed from the tail of its log after a switch."""
+    if snapshot_ring.source != JSON_FILE:
+        pair = current_pair()
+        snapshot_ring.warm(JSON_FILE, tick_store.tail(pair, SNAPSHOT_RING_COUNT), tick_store.count(pair))
+    return snapshot_ring
+
+def recent_records(n):
+    """Last `n` records of the current pair; disk is only read when the ring does not reach back far enough."""
+    records = current_snapshots().tail(n)
+    if records is None:
+        records = tick_store.tail(current_pair(), n)
+    return records
+
+def current_pair():
+    """Storage key of the current pair (the stem of JSON_FILE, "pending" until configured)."""
+    return JSON_FILE.stem
+
+def columns_for(pair):
+    """Column store for `pair`, backfilled from storage on first use."""
+    return store_for(DATA_DIR, pair, lambda: tick_store.iter_lines(pair))
+
+def current_columns():
+    return columns_for(current_pair())
+
+def _column_value(value, missing=0):
+    value = float(value)
+    return missing if value != value else value  # NaN marks a tick without the field
+
+def get_latest_data():
+    return current_snapshots().latest()
+
+# Dashboard payloads are rebuilt once per snapshot (or column row) and served pre-serialized with an ETag
+view_cache = ViewCache(lambda: (current_snapshots().version, current_columns().rows))
+
+# Response compression, negotiated on Accept-Encoding (brotli preferred over gzip)
+COMPRESSORS = {
+    "br": lambda data: brotli.compress(data, quality=5),
+    "gzip": lambda data: gzip.compress(data, compresslevel=6),
+}
+MIN_COMPRESS_BYTES = 512
+
+def _accepted_encoding():
+    for encoding in COMPRESSORS:
+        if request.accept_encodings[encoding]:
+            return encoding
+    return None
+
+def _json_response(body, encoded=None):
+    """JSON response for `body`; `encoded(encoding)` returns the compressed body, compressing per call if not given."""
+    encoding = _accepted_encoding() if len(body) >= MIN_COMPRESS_BYTES else None
+    if encoding:
+        response = Response((encoded or (lambda enc: COMPRESSORS[enc](body)))(encoding), mimetype="application/json")
+        response.headers["Content-Encoding"] = encoding
+    else:
+        response = Response(body, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    return response
+
+def serve_view(name, build):
+    """Serve the cached `name` view (compressed once per tick), answering a matching If-None-Match with 304."""
     try:
-        latest = get_latest_data()
-        p = latest.get("platform_data", {})
-        x_local = latest.get("x_data", {})
-        member_count = 0
-        if latest.get("x_data_type") == "community":
-            member_count = x_local.get("fetchOne", {}).get("member_count", 0)
-        elif latest.get("x_data_type") == "single_account":
-            profile = x_local.get("profile", {})
-            if profile and not profile.get("error"):
-                member_count = profile.get("followers_count", 0)
-        elif latest.get("x_data_type") == "post":
-            post = x_local.get("post", {})
-            if post and not post.get("error"):
-                member_count = post.get("user", {}).get("followers_count", 0)
-        return jsonify({
-            "marketCapUSD": p.get("marketCapUSD", 0),
-            "volumeUSD": p.get("volumeUSD", 0),
-            "holders": p.get("numHolders", 0),
-            "liquidityUSD": p.get("initialLiquiditySol", 0) * cached_sol_price["price"] if p.get("initialLiquiditySol") else 0,
-            "uniqueAuthors": latest.get("unique_authors", 0),
-            "memberCount": member_count,
-            "solPrice": p.get("solPriceUSD", 0),
-            "lastUpdated": latest.get("timestamp", "")
-        })
+        view = view_cache.get(name, build)
     except Exception as e:
+        print(f"❌ Error building {name} view: {e}")
         return jsonify({"error": str(e)}), 500
+    return _view_response(view)
+
+def _view_response(view):
+    response = _json_response(view.body, lambda encoding: view.encoded(encoding, COMPRESSORS[encoding]))
+    # Weak, since the compressed and identity bodies share the tag
+    response.set_etag(view.etag, weak=True)
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+def _compressed_stream(chunks, encoding):
+    """Compress a stream of byte chunks on the fly."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    buffer = BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=6) as f:
+        for chunk in chunks:
+            f.write(chunk)
+            if buffer.tell() >= 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    yield buffer.getvalue()
+
+def _holders_view():
+    latest = get_latest_data()
+
+    history_data = []
+    for data in recent_records(100):
+        try:
+            timestamp = datetime.fromisoformat(data["timestamp"])
+            history_data.append({
+                "timestamp": timestamp.isoformat(),
+                "time": timestamp.strftime("%H:%M"),
+                "value": data.get("platform_data", {}).get("numHolders", 0),
+                "marketCap": data.get("platform_data", {}).get("marketCapUSD", 0),
+                "uniqueAuthors": data.get("unique_authors", 0),
+                "totalViews": sum(t.get("views", 0) for t in data.get("x_data", {}).get("timeline", []) if isinstance(t.get("views"), (int, float)))
+            })
+        except Exception as e:
+            print(f"Error parsing history data: {e}")
+            continue
 
-def get_latest_data():
-    if os.path.exists(JSON_FILE):
-        with open(JSON_FILE, "rb") as f:
-            try:
-                f.seek(-2, os.SEEK_END)
-                while f.read(1) != b"\n":
-                    f.seek(-2, os.SEEK_CUR)
-            except OSError:
-                f.seek(0)
-            last_line = f.readline().decode().strip()
-            if last_line:
-                return json.loads(last_line)
-    return {}
+    current_holders = latest.get("platform_data", {}).get("numHolders", 0)
+    wallet_age_data = latest.get("platform_data", {}).get("walletAgeCounts", {})
+
+    percent_change = 0
+    holder_increase = 0
+    if len(history_data) >= 2:
+        previous_holders = history_data[-2]["value"]
+        if previous_holders > 0:
+            percent_change = ((current_holders - previous_holders) / previous_holders) * 100
+            holder_increase = current_holders - previous_holders
+
+    return {
+        "current": {
+            "holderCount": current_holders,
+            "percentChange": round(percent_change, 2),
+            "holderIncrease": holder_increase,
+            "lastUpdated": latest.get("timestamp", ""),
+            "walletAgeDistribution": wallet_age_data,
+            "totalHolders": latest.get("platform_data", {}).get("totalHolders", 0)
+        },
+        "history": history_data,
+        "timeline": latest.get("x_data", {}).get("timeline", [])
+    }
 
 @app.route("/api/holders")
 def holders_data():
-    try:
-        if os.path.exists(JSON_FILE):
-            with open(JSON_FILE, "rb") as f:
-                try:
-                    f.seek(-2, os.SEEK_END)
-                    while f.read(1) != b"\n":
-                        f.seek(-2, os.SEEK_CUR)
-                except OSError:
-                    f.seek(0)
-                last_line = f.readline().decode().strip()
-                latest = json.loads(last_line) if last_line else {}
-        else:
-            latest = {}
-
-        history_data = []
-        if os.path.exists(JSON_FILE):
-            with open(JSON_FILE, "r", encoding="utf-8") as f:
-                lines = f.readlines()[-100:]
-                for line in lines:
-                    try:
-                        data = json.loads(line)
-                        timestamp = datetime.fromisoformat(data["timestamp"])
-                        history_data.append({
-                            "timestamp": timestamp.isoformat(),
-                            "time": timestamp.strftime("%H:%M"),
-                            "value": data.get("platform_data", {}).get("numHolders", 0),
-                            "marketCap": data.get("platform_data", {}).get("marketCapUSD", 0),
-                            "uniqueAuthors": data.get("unique_authors", 0),
-                            "totalViews": sum(t.get("views", 0) for t in data.get("x_data", {}).get("timeline", []) if isinstance(t.get("views"), (int, float)))
-                        })
-                    except Exception as e:
-                        print(f"Error parsing history data: {e}")
-                        continue
+    return serve_view("holders", _holders_view)
 
-        current_holders = latest.get("platform_data", {}).get("numHolders", 0)
-        wallet_age_data = latest.get("platform_data", {}).get("walletAgeCounts", {})
+def _data_view():
+    latest = get_latest_data()
+    if latest:
+        return latest
+    return {"error": "No data available", "timestamp": datetime.now().isoformat()}
 
-        percent_change = 0
-        holder_increase = 0
-        if len(history_data) >= 2:
-            previous_holders = history_data[-2]["value"]
-            if previous_holders > 0:
-                percent_change = ((current_holders - previous_holders) / previous_holders) * 100
-                holder_increase = current_holders - previous_holders
+@app.route("/api/data")
+def latest_data_route():
+    return serve_view("data", _data_view)
+
+# Panels /api/dashboard can batch, in response order
+DASHBOARD_PANELS = {
+    "metrics": _metrics_view,
+    "marketcap": _marketcap_view,
+    "buys-sells": _buys_sells_view,
+    "holders": _holders_view,
+    "social": _social_view,
+    "wallet-age": _wallet_age_view,
+    "tokeninfo": _tokeninfo_view,
+    "twitter-search": _twitter_search_view,
+    "data": _data_view,
+    "x-data": _x_data_view,
+}
 
-        return jsonify({
-            "current": {
-                "holderCount": current_holders,
-                "percentChange": round(percent_change, 2),
-                "holderIncrease": holder_increase,
-                "lastUpdated": latest.get("timestamp", ""),
-                "walletAgeDistribution": wallet_age_data,
-                "totalHolders": latest.get("platform_data", {}).get("totalHolders", 0)
-            },
-            "history": history_data,
-            "timeline": latest.get("x_data", {}).get("timeline", [])
-        })
+@app.route("/api/dashboard")
+def dashboard_data():
+    """Several panels from the same snapshot in one response: ?fields=metrics,holders,... (default: all)."""
+    fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()] or list(DASHBOARD_PANELS)
+    unknown = [f for f in fields if f not in DASHBOARD_PANELS]
+    if unknown:
+        return jsonify({"error": f"Unknown panels: {', '.join(unknown)}", "panels": list(DASHBOARD_PANELS)}), 400
+    fields = [f for f in DASHBOARD_PANELS if f in fields]
+    # A panel that fails comes back as {"error": ...} without failing the others
+    view = view_cache.batch("dashboard:" + ",".join(fields), {f: DASHBOARD_PANELS[f] for f in fields})
+    return _view_response(view)
+
+def history_between(pair, start=None, end=None, limit=None):
+    """Stored ticks of `pair` in [start, end], preceded by rollups for the part already compacted."""
+    records = compaction_job.records(pair, start, end) + tick_store.range(pair, start, end, limit)
+    return records[-limit:] if limit else records
+
+@app.route("/api/history")
+def history_data():
+    """Last 50 ticks of the current pair, or a range: ?from=...&to=...&limit=...&pair=... (ISO or epoch seconds)."""
+    start, end = request.args.get("from"), request.args.get("to")
+    pair = request.args.get("pair") or current_pair()
+    limit = request.args.get("limit", type=int)
+    try:
+        if start or end or pair != current_pair():
+            return _json_response(json.dumps(history_between(pair, start, end, limit or 1000), ensure_ascii=False).encode("utf-8"))
+        if not limit or limit == 50:
+            return serve_view("history", lambda: recent_records(50))
+        return _json_response(json.dumps(recent_records(limit), ensure_ascii=False).encode("utf-8"))
     except Exception as e:
-        print(f"Error in holders endpoint: {e}")
         return jsonify({"error": str(e)}), 500
 
-@app.route("/api/data")
-def latest_data_route():
+@app.route("/api/rollups")
+def rollups_data():
+    """Downsampled history of compacted ticks: ?interval=1m|15m&pair=...&from=...&to=... (ISO bucket starts)."""
+    intervals = {"1m": MINUTE, "15m": QUARTER_HOUR}
+    interval = request.args.get("interval", "1m")
+    if interval not in intervals:
+        return jsonify({"error": "interval must be 1m or 15m"}), 400
+    pair = request.args.get("pair") or current_pair()
     try:
-        if os.path.exists(JSON_FILE):
-            with open(JSON_FILE, "rb") as f:
-                try:
-                    f.seek(-2, os.SEEK_END)
-                    while f.read(1) != b"\n":
-                        f.seek(-2, os.SEEK_CUR)
-                except OSError:
-                    f.seek(0)
-                last_line = f.readline().decode().strip()
-                if last_line:
-                    return jsonify(json.loads(last_line))
-        return jsonify({"error": "No data available", "timestamp": datetime.now().isoformat()})
+        return jsonify(compaction_job.read(pair, intervals[interval], request.args.get("from"), request.args.get("to")))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/api/history")
-def history_data():
-    if os.path.exists(JSON_FILE):
-        with open(JSON_FILE, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            last_50 = [json.loads(line) for line in lines[-50:]]
-            return jsonify(last_50)
-    return jsonify([])
+@app.route("/api/pairs")
+def pairs_data():
+    """Pairs with stored history."""
+    return jsonify(tick_store.pairs())
 
 # -------------------------
 # CONFIGURATION
@@ -1649,8 +2142,17 @@ def update_config():
         SEARCH_QUERY = pair_address  # use the contract as default search query
         DATA_SOURCE = data_source
 
-        # Update file target now that pair is known
+        # Update file target now that pair is known, and pre-warm its snapshot ring and columns
         _set_json_file_from_pair()
+        current_snapshots()
+        current_columns()
+
+        # Cached source values belong to the previous pair
+        for cache in source_caches.values():
+            cache.reset()
+        x_meta_cache.clear()
+        axiom_last_payloads.clear()
+        tick_scheduler.reset_activity()
 
         # Determine X data type (auto if needed) by reading platform data twitter URL
         twitter_url = None
@@ -1727,6 +2229,8 @@ def update_config():
 
                 threading.Thread(target=update_sol_price, daemon=True).start()
                 threading.Thread(target=background_fetcher, daemon=True).start()
+                tick_writer.start()
+                compaction_job.start()
 
                 server_status["is_running"] = True
                 server_status["is_configured"] = True
@@ -1769,20 +2273,76 @@ def get_config():
 
 @app.route("/api/download")
 def download_data():
-    if os.path.exists(JSON_FILE):
-        return send_file(
-            JSON_FILE,
-            mimetype='application/json',
-            as_attachment=True,
-            download_name='trading_data.json'
-        )
+    if tick_store.count(current_pair()):
+        lines = _resolved_lines(tick_store.iter_lines(current_pair()))
+        headers = {"Content-Disposition": "attachment; filename=trading_data.json", "Vary": "Accept-Encoding"}
+        encoding = _accepted_encoding()
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            lines = _compressed_stream(lines, encoding)
+        return Response(lines, mimetype='application/json', headers=headers)
     return jsonify({"error": "No data available"}), 404
 
+def _resolved_lines(lines):
+    """Stream stored lines with blob references expanded back into full records."""
+    for line in lines:
+        if b'"$blob"' not in line:
+            yield line
+            continue
+        try:
+            yield (json.dumps(blob_store.resolve(json.loads(line)), ensure_ascii=False) + "\n").encode("utf-8")
+        except Exception:
+            continue
+
 def cleanup_old_files():
-    daily_files = sorted(DATA_DIR.glob("data_*.json"))
-    if len(daily_files) > 7:
-        for old_file in daily_files[:-7]:
-            old_file.unlink()
+    try:
+        daily_index.cleanup()
+    except Exception as e:
+        print(f"❌ Error cleaning up daily index: {e}")
+
+def records_for_day(day, pair=None):
+    """Ticks of one day (YYYYMMDD) across pairs, as {"pair", "data"} in write order.
+
+    Legacy data_<day>.json files carry no pair and are only included when no pair is asked for.
+    """
+    results = []
+    legacy = daily_index.legacy_path(day)
+    if pair is None and os.path.exists(legacy):
+        with open(legacy, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    results.append({"pair": None, "data": blob_store.resolve(json.loads(line))})
+                except Exception:
+                    continue
+
+    by_pair = {}
+    for entry in daily_index.entries(day):
+        if pair is None or entry["pair"] == pair:
+            by_pair.setdefault(entry["pair"], []).append(entry)
+    for entry_pair, entries in by_pair.items():
+        if all(e["seg"] is not None for e in entries):
+            records = tick_store.read_at(entry_pair, [(e["seg"], e["off"]) for e in entries])
+            if len(records) < len(entries):
+                # Some of the day's segments were compacted: serve that part from the rollups
+                records = compaction_job.records(entry_pair, entries[0]["ts"], entries[-1]["ts"]) + records
+        else:
+            # No byte locations (e.g. SQLite): read the day's time range instead
+            records = history_between(entry_pair, entries[0]["ts"], entries[-1]["ts"])
+        results.extend({"pair": entry_pair, "data": record} for record in records)
+    return results
+
+@app.route("/api/daily")
+def daily_days():
+    """Days that can be retrieved through /api/daily/<YYYYMMDD>."""
+    return jsonify(daily_index.days())
+
+@app.route("/api/daily/<day>")
+def daily_data(day):
+    try:
+        day = day.replace("-", "")
+        return jsonify(records_for_day(day, request.args.get("pair")))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
 server_status = {
     "is_running": False,        # important: start stopped
@@ -0,0 +1,165 @@
+import collections
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+# Content-addressed store for the heavy, slow-changing parts of a tick snapshot.
+#
+# The holders list, the X timeline and the search authors list are identical
+# across most consecutive ticks. Before a record is persisted, each of them is
+# serialized, hashed (SHA-256) and written once to data/blobs/<h[:2]>/<h>.json;
+# the row keeps {"$blob": "<h>", "type": "list"|"dict"} in its place. Readers
+# call resolve() to put the original values back; a blob that has gone missing
+# comes back as an empty container of the recorded type (or, for references
+# written without one, the field is left out). Rows written before this existed
+# carry no references and resolve to themselves. Blobs no stored row references any more are removed by
+# sweep(), which compaction runs after dropping expired raw ticks.
+
+BLOB_FIELDS = (
+    ("platform_data", "holders"),
+    ("x_data", "timeline"),
+    ("search_metrics", "unique_authors"),
+)
+REF_KEY = "$blob"
+CONTAINERS = {"list": list, "dict": dict}
+MIN_BLOB_BYTES = 256        # smaller values are cheaper to keep inline
+CACHE_SIZE = 256
+REF_PATTERN = re.compile(rb'"\$blob": "([0-9a-f]{64})"')
+
+
+def references(line):
+    """Digests of the blobs a stored line (bytes) refers to."""
+    return {m.decode("ascii") for m in REF_PATTERN.findall(line)}
+
+
+class BlobStore:
+    def __init__(self, directory):
+        self.directory = directory
+        self._known = set()
+        self._cache = collections.OrderedDict()
+        self._used = {}             # digest -> last put() time, protects rows not yet stored from sweep()
+        self._lock = threading.Lock()
+        self.stored = 0
+        self.reused = 0
+        self.swept = 0
+
+    def _path(self, digest):
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def _remember(self, digest, value):
+        self._cache[digest] = value
+        self._cache.move_to_end(digest)
+        while len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def put(self, value, data=None):
+        """Store `value` (serialized as `data` if given) once and return its digest."""
+        if data is None:
+            data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._used[digest] = time.time()
+            if digest in self._known:
+                self.reused += 1
+                return digest
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            with self._lock:
+                self.stored += 1
+        else:
+            with self._lock:
+                self.reused += 1
+        with self._lock:
+            self._known.add(digest)
+            self._remember(digest, value)
+        return digest
+
+    def get(self, digest):
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return self._cache[digest]
+        with open(self._path(digest), "r", encoding="utf-8") as f:
+            value = json.load(f)
+        with self._lock:
+            self._remember(digest, value)
+        return value
+
+    def dedup(self, record):
+        """(copy of `record` with the heavy fields replaced by blob references, bytes those references stand for)."""
+        compact = dict(record)
+        saved = 0
+        for parent, field in BLOB_FIELDS:
+            section = compact.get(parent)
+            if not isinstance(section, dict) or not section.get(field):
+                continue
+            value = section[field]
+            data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+            if len(data) < MIN_BLOB_BYTES:
+                continue
+            ref = {REF_KEY: self.put(value, data), "type": type(value).__name__}
+            compact[parent] = {**section, field: ref}
+            saved += len(data) - len(json.dumps(ref))
+        return compact, saved
+
+    def resolve(self, record):
+        """Copy of `record` with blob references replaced by their values (unchanged if it has none)."""
+        resolved = record
+        for parent, field in BLOB_FIELDS:
+            section = record.get(parent)
+            if not isinstance(section, dict):
+                continue
+            ref = section.get(field)
+            if not isinstance(ref, dict) or REF_KEY not in ref:
+                continue
+            if resolved is record:
+                resolved = dict(record)
+            try:
+                resolved[parent] = {**section, field: self.get(ref[REF_KEY])}
+            except Exception as e:
+                print(f"❌ Missing blob {ref[REF_KEY][:12]} for {parent}.{field}: {e}")
+                empty = CONTAINERS.get(ref.get("type"))
+                if empty is not None:
+                    resolved[parent] = {**section, field: empty()}
+                else:
+                    resolved[parent] = {k: v for k, v in section.items() if k != field}
+        return resolved
+
+    def sweep(self, live, since):
+        """Delete the stored blobs that are not in `live` and were not put since `since` (epoch seconds).
+
+        Returns how many were removed. A blob put concurrently is either protected by its use time or,
+        once deleted, rewritten by that put(), since both sides hold the lock around their checks.
+        """
+        removed = 0
+        for path in self.directory.glob("*/*.json"):
+            digest = path.stem
+            with self._lock:
+                if digest in live or self._used.get(digest, 0) >= since:
+                    continue
+                self._known.discard(digest)
+                self._cache.pop(digest, None)
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        with self._lock:
+            self._used = {d: t for d, t in self._used.items() if t >= since}
+            self.swept += removed
+        return removed
+
+    def status(self):
+        with self._lock:
+            return {
+                "known": len(self._known), "cached": len(self._cache),
+                "stored": self.stored, "reused": self.reused, "swept": self.swept,
+            }
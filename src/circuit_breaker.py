@@ -0,0 +1,112 @@
+import random
+import threading
+import time
+
+import requests
+
+# Circuit breakers per upstream family (axiom, alpha, x, coingecko).
+#
+# closed    -> requests flow; consecutive failures are counted
+# open      -> requests fail fast until a jittered exponential backoff expires
+# half_open -> a single trial request decides between closed and open again
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=3, base_backoff=2.0, max_backoff=120.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.open_count = 0          # consecutive trips, drives the backoff exponent
+        self.open_until = 0.0
+        self.trial_in_flight = False
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.last_error = None
+        self.last_change = time.time()
+        self._lock = threading.Lock()
+
+    def _set_state(self, state):
+        if state != self.state:
+            print(f"🔌 Circuit '{self.name}': {self.state} → {state}")
+            self.state = state
+            self.last_change = time.time()
+
+    def allow(self):
+        """True if a request may go out now; False means fail fast."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.time() >= self.open_until:
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            self.total_rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.open_count = 0
+            self.trial_in_flight = False
+            self._set_state(CLOSED)
+
+    def release_trial(self):
+        """The upstream answered but the outcome says nothing about its health; free the trial slot."""
+        with self._lock:
+            self.trial_in_flight = False
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            self.last_error = str(error) if error is not None else None
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                backoff = min(self.max_backoff, self.base_backoff * (2 ** self.open_count))
+                # Full jitter keeps several workers from probing the upstream in lockstep
+                self.open_until = time.time() + random.uniform(backoff / 2, backoff)
+                self.open_count += 1
+                self.trial_in_flight = False
+                self._set_state(OPEN)
+
+    def status(self):
+        with self._lock:
+            retry_in = max(self.open_until - time.time(), 0) if self.state == OPEN else 0
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in_seconds": round(retry_in, 1),
+                "total_failures": self.total_failures,
+                "total_rejected": self.total_rejected,
+                "last_error": self.last_error,
+                "since": self.last_change,
+            }
+
+
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name):
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def breaker_status():
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.status() for b in breakers}
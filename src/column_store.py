@@ -0,0 +1,201 @@
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import numpy as np
+
+# Columnar, memory-mapped time series of the numeric platform_data fields.
+#
+# Each pair gets a directory data/columns/<pair>/ holding one fixed-width file
+# per field (float64, NaN when a tick had no value) plus a timestamp column
+# (int64 microseconds since the epoch, local time as written by the fetcher).
+# Chart queries slice NumPy views of these files instead of parsing ~10 KB JSON
+# lines. The timestamp column is appended last, so after a crash mid-append the
+# row count is taken from it and longer columns are trimmed back.
+#
+# trim() drops rows older than a cutoff (compaction calls it at the raw
+# horizon) by writing the kept rows to <pair>.new/ and swapping directories:
+# <pair> -> <pair>.old, <pair>.new -> <pair>. Opening a store finishes or
+# discards a swap interrupted by a crash.
+
+NUMERIC_FIELDS = (
+    "marketCapUSD", "marketCapSol", "volumeUSD", "volumeSol",
+    "buyVolumeUSD", "sellVolumeUSD", "buyVolumeSol", "sellVolumeSol",
+    "netCount", "numHolders", "totalHolders", "supply",
+    "liquidityUSD", "solPriceUSD", "fibLevel62", "fibLevel50",
+    "top10HoldersPercent", "insidersHoldPercent", "bundlersHoldPercent", "snipersHoldPercent",
+)
+VALUE_DTYPE = np.dtype("<f8")
+TIME_DTYPE = np.dtype("<i8")
+TIME_COLUMN = "timestamp"
+TRIM_MIN_ROWS = 1000        # fewer expired rows than this are left for a later trim
+
+
+def _epoch_us(timestamp):
+    return int(round(datetime.fromisoformat(timestamp).timestamp() * 1_000_000))
+
+
+def _row(record):
+    """(timestamp_us, {field: float}) for one tick record, or None if it has no usable timestamp."""
+    try:
+        ts = _epoch_us(record["timestamp"])
+    except Exception:
+        return None
+    platform = record.get("platform_data") or {}
+    values = {}
+    for field in NUMERIC_FIELDS:
+        value = platform.get(field)
+        values[field] = float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+    return ts, values
+
+
+class ColumnStore:
+    def __init__(self, directory):
+        self.directory = directory
+        self._finish_trim()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._maps = {}             # column -> (rows, memmap) cache
+        self.rows = self._recover()
+
+    def _path(self, column):
+        return self.directory / f"{column}.col"
+
+    def _sibling(self, suffix):
+        return self.directory.with_name(self.directory.name + suffix)
+
+    def _finish_trim(self):
+        """Complete or discard a trim() interrupted by a crash."""
+        fresh, old = self._sibling(".new"), self._sibling(".old")
+        if fresh.exists() and not self.directory.exists():
+            # Crashed between the two renames; the new copy was complete before the first one
+            os.replace(fresh, self.directory)
+        shutil.rmtree(fresh, ignore_errors=True)
+        shutil.rmtree(old, ignore_errors=True)
+
+    def _recover(self):
+        """Align every column to the timestamp column's length (trim a torn append, pad new fields)."""
+        ts_path = self._path(TIME_COLUMN)
+        rows = os.path.getsize(ts_path) // TIME_DTYPE.itemsize if os.path.exists(ts_path) else 0
+        if os.path.exists(ts_path) and os.path.getsize(ts_path) != rows * TIME_DTYPE.itemsize:
+            os.truncate(ts_path, rows * TIME_DTYPE.itemsize)
+        for field in NUMERIC_FIELDS:
+            path = self._path(field)
+            expected = rows * VALUE_DTYPE.itemsize
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if size > expected:
+                os.truncate(path, expected)
+            elif size < expected:
+                # Field added after this pair started recording
+                with open(path, "ab") as f:
+                    np.full((expected - size) // VALUE_DTYPE.itemsize, np.nan, dtype=VALUE_DTYPE).tofile(f)
+        return rows
+
+    def _write_rows(self, rows):
+        for field in NUMERIC_FIELDS:
+            with open(self._path(field), "ab") as f:
+                np.asarray([values[field] for _, values in rows], dtype=VALUE_DTYPE).tofile(f)
+        with open(self._path(TIME_COLUMN), "ab") as f:
+            np.asarray([ts for ts, _ in rows], dtype=TIME_DTYPE).tofile(f)
+        self.rows += len(rows)
+
+    def append(self, record):
+        row = _row(record)
+        if row is None:
+            return
+        with self._lock:
+            self._write_rows([row])
+
+    def backfill(self, lines, batch=1000):
+        """Load existing JSONL lines (oldest first) into an empty store."""
+        if self.rows:
+            return 0
+        loaded = 0
+        pending = []
+        with self._lock:
+            for line in lines:
+                try:
+                    row = _row(json.loads(line))
+                except Exception:
+                    continue
+                if row is not None:
+                    pending.append(row)
+                if len(pending) >= batch:
+                    self._write_rows(pending)
+                    loaded += len(pending)
+                    pending = []
+            if pending:
+                self._write_rows(pending)
+                loaded += len(pending)
+        return loaded
+
+    def trim(self, before):
+        """Drop the rows older than `before` (epoch seconds); returns how many were dropped."""
+        with self._lock:
+            if not self.rows:
+                return 0
+            times = self._column(TIME_COLUMN, self.rows)
+            drop = int(np.searchsorted(times, int(before * 1_000_000), side="left"))
+            if drop < TRIM_MIN_ROWS:
+                return 0
+            fresh, old = self._sibling(".new"), self._sibling(".old")
+            shutil.rmtree(fresh, ignore_errors=True)
+            fresh.mkdir(parents=True)
+            for column in (TIME_COLUMN,) + NUMERIC_FIELDS:
+                self._column(column, self.rows)[drop:].tofile(fresh / f"{column}.col")
+            # Views already handed out keep the old (unlinked) files mapped
+            self._maps.clear()
+            os.replace(self.directory, old)
+            os.replace(fresh, self.directory)
+            shutil.rmtree(old, ignore_errors=True)
+            self.rows -= drop
+            return drop
+
+    def _column(self, column, rows):
+        cached = self._maps.get(column)
+        if cached is not None and cached[0] == rows:
+            return cached[1]
+        dtype = TIME_DTYPE if column == TIME_COLUMN else VALUE_DTYPE
+        mapped = np.memmap(self._path(column), dtype=dtype, mode="r", shape=(rows,))
+        self._maps[column] = (rows, mapped)
+        return mapped
+
+    def window(self, fields, start=None, end=None, last=None):
+        """Timestamps (µs) and read-only views of `fields` for ticks in [start, end], newest `last` of them.
+
+        `start`/`end` are datetimes or epoch seconds.
+        """
+        with self._lock:
+            rows = self.rows
+            if rows == 0:
+                return np.empty(0, dtype=TIME_DTYPE), {f: np.empty(0, dtype=VALUE_DTYPE) for f in fields}
+            times = self._column(TIME_COLUMN, rows)
+            lo, hi = 0, rows
+            if start is not None:
+                start = start.timestamp() if isinstance(start, datetime) else start
+                lo = int(np.searchsorted(times, int(start * 1_000_000), side="left"))
+            if end is not None:
+                end = end.timestamp() if isinstance(end, datetime) else end
+                hi = int(np.searchsorted(times, int(end * 1_000_000), side="right"))
+            if last is not None:
+                lo = max(lo, hi - last)
+            return times[lo:hi], {f: self._column(f, rows)[lo:hi] for f in fields}
+
+
+_stores = {}
+_registry_lock = threading.Lock()
+
+
+def store_for(data_dir, pair, backfill_lines=None):
+    """Shared ColumnStore for a pair; backfilled from `backfill_lines()` (stored JSONL lines) when first created."""
+    with _registry_lock:
+        store = _stores.get(pair)
+        if store is None:
+            store = _stores[pair] = ColumnStore(data_dir / "columns" / pair)
+            if backfill_lines is not None:
+                loaded = store.backfill(backfill_lines())
+                if loaded:
+                    print(f"📊 Backfilled {loaded} ticks of {pair} into the column store")
+        return store
@@ -0,0 +1,333 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from blob_store import references
+from timestamps import epoch, record_epoch
+
+# Background retention: downsample old raw ticks instead of deleting them.
+#
+# Raw ticks older than raw_max_age are folded into 1-minute rollups and removed
+# from the tick store (whole sealed segments for JSONL, rows for SQLite).
+# 1-minute rollups older than minute_max_age are folded into 15-minute rollups.
+# Rollups live in data/rollups/<pair>/{1m,15m}.jsonl, one bucket per line:
+#     {"bucket": "<ISO start>", "interval": 60, "count": n,
+#      "marketCapUSD": {"open", "high", "low", "close"}, "volumeUSD": <last>, "numHolders": <last>, ...}
+# Readers of raw history fall back to records() for the compacted part, which
+# returns the rollups shaped like ticks (closing values in platform_data).
+#
+# The same pass trims the column store at the raw horizon and sweeps blobs that
+# no remaining raw tick references (see blob_store).
+
+OHLC_FIELDS = ("marketCapUSD", "marketCapSol")
+# Fields that are per-tick deltas and add up across a bucket. The pair-stats
+# volumes and counts are not: every tick carries a snapshot of the same rolling
+# window, so they roll up as their last value like the other LAST_FIELDS.
+SUM_FIELDS = ()
+LAST_FIELDS = (
+    "volumeUSD", "volumeSol", "buyVolumeUSD", "sellVolumeUSD", "buyVolumeSol", "sellVolumeSol", "netCount",
+    "numHolders", "totalHolders", "solPriceUSD", "liquidityUSD", "supply",
+    "top10HoldersPercent", "insidersHoldPercent", "bundlersHoldPercent", "snipersHoldPercent",
+)
+MINUTE = 60
+QUARTER_HOUR = 15 * 60
+INTERVAL_NAMES = {MINUTE: "1m", QUARTER_HOUR: "15m"}
+BLOB_GRACE = 600            # blobs put this recently may belong to ticks still on their way to the store
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _bucket_start(ts, interval):
+    return datetime.fromtimestamp(ts - ts % interval).isoformat()
+
+
+def _tick_rollup(record, interval):
+    """A one-tick rollup of `record` in its `interval` bucket, or None without a usable timestamp."""
+    ts = record_epoch(record)
+    if ts is None:
+        return None
+    platform = record.get("platform_data") or {}
+    rollup = {"bucket": _bucket_start(ts, interval), "interval": interval, "count": 1}
+    for field in OHLC_FIELDS:
+        value = _number(platform.get(field))
+        if value is not None:
+            rollup[field] = {"open": value, "high": value, "low": value, "close": value}
+    for field in SUM_FIELDS:
+        value = _number(platform.get(field))
+        if value is not None:
+            rollup[field] = value
+    for field in LAST_FIELDS:
+        value = _number(platform.get(field))
+        if value is not None:
+            rollup[field] = value
+    authors = _number(record.get("unique_authors"))
+    if authors is not None:
+        rollup["unique_authors"] = authors
+    return rollup
+
+
+def _merge(older, newer):
+    """Combine two rollups of the same bucket; `older` covers the earlier ticks."""
+    merged = dict(older)
+    merged["count"] = older.get("count", 0) + newer.get("count", 0)
+    for field in OHLC_FIELDS:
+        a, b = older.get(field), newer.get(field)
+        if a and b:
+            merged[field] = {
+                "open": a["open"], "close": b["close"],
+                "high": max(a["high"], b["high"]), "low": min(a["low"], b["low"]),
+            }
+        elif b:
+            merged[field] = b
+    for field in SUM_FIELDS:
+        if field in newer:
+            merged[field] = older.get(field, 0) + newer[field]
+    for field in LAST_FIELDS + ("unique_authors",):
+        if field in newer:
+            merged[field] = newer[field]
+    return merged
+
+
+def as_record(rollup):
+    """A rollup in tick form: closing market caps, summed volumes and last values in platform_data."""
+    platform = {field: rollup[field]["close"] for field in OHLC_FIELDS if field in rollup}
+    platform.update({field: rollup[field] for field in SUM_FIELDS + LAST_FIELDS if field in rollup})
+    record = {
+        "timestamp": rollup["bucket"],
+        "platform_data": platform,
+        "rollup": {
+            "interval": rollup["interval"],
+            "count": rollup.get("count", 0),
+            "ohlc": {field: rollup[field] for field in OHLC_FIELDS if field in rollup},
+        },
+    }
+    if "unique_authors" in rollup:
+        record["unique_authors"] = rollup["unique_authors"]
+    return record
+
+
+def bucketize(rollups, interval):
+    """Fold time-ordered rollups (or one-tick rollups) into `interval` buckets."""
+    buckets = []
+    for rollup in rollups:
+        coarse = {**rollup, "bucket": _bucket_start(epoch(rollup["bucket"]), interval), "interval": interval}
+        if buckets and buckets[-1]["bucket"] == coarse["bucket"]:
+            buckets[-1] = _merge(buckets[-1], coarse)
+        else:
+            buckets.append(coarse)
+    return buckets
+
+
+class RollupFile:
+    """One rollup file; its first line holds {"meta": {...}}, written in the same atomic replace as the rows."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """(meta, rows) of the file."""
+        meta, rows = {}, []
+        if not os.path.exists(self.path):
+            return meta, rows
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except Exception:
+                    continue
+                if "meta" in row:
+                    meta = row["meta"]
+                else:
+                    rows.append(row)
+        return meta, rows
+
+    def read(self):
+        return self.load()[1]
+
+    def save(self, meta, rows):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"meta": meta}) + "\n")
+            f.write("".join(json.dumps(r) + "\n" for r in rows))
+        os.replace(tmp, self.path)
+
+
+def _add(rows, buckets):
+    """Merge time-ordered buckets into sorted rows (the first may continue the last row's bucket)."""
+    for bucket in buckets:
+        if rows and rows[-1]["bucket"] == bucket["bucket"]:
+            rows[-1] = _merge(rows[-1], bucket)
+        elif rows and rows[-1]["bucket"] > bucket["bucket"]:
+            # Out of order (e.g. a segment sealed late); keep the rows sorted
+            rows.append(bucket)
+            rows.sort(key=lambda r: r["bucket"])
+        else:
+            rows.append(bucket)
+    return rows
+
+
+class CompactionJob:
+    def __init__(self, store, rollup_dir, raw_max_age, minute_max_age, every=600, columns=None):
+        """`columns(pair)` returns the pair's ColumnStore, or None if it has none."""
+        self.store = store
+        self.columns = columns
+        self.rollup_dir = rollup_dir
+        self.raw_max_age = raw_max_age
+        self.minute_max_age = minute_max_age
+        self.every = every
+        self._thread = None
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.compacted_ticks = 0
+        self.promoted_minutes = 0
+        self.trimmed_rows = 0
+        self.swept_blobs = 0
+        self.last_run = None
+        self.last_run_ms = 0.0
+        self.last_error = None
+
+    def rollup(self, pair, interval):
+        return RollupFile(self.rollup_dir / pair / f"{INTERVAL_NAMES[interval]}.jsonl")
+
+    def compact_pair(self, pair, now=None):
+        """Roll up and drop expired raw batches of `pair`, promote old 1m buckets to 15m and trim its columns.
+
+        Returns (ticks compacted, 1m buckets promoted, column rows trimmed).
+
+        Each step records how far it got in the same atomic write as its rows: the 1m file
+        keeps the last rolled-up batch id, and both files keep the last promoted 1m bucket.
+        An interrupted run is finished from those markers, so nothing is rolled up twice.
+        """
+        now = time.time() if now is None else now
+        minutes, quarters = self.rollup(pair, MINUTE), self.rollup(pair, QUARTER_HOUR)
+        minute_meta, rows = minutes.load()
+        quarter_meta, quarter_rows = quarters.load()
+
+        # Finish an interrupted run: the last rolled-up batch may not have been dropped yet,
+        # and promoted 1m buckets may not have been removed from the 1m file yet
+        rolled_up = minute_meta.get("rolled_up")
+        if rolled_up is not None:
+            self.store.drop(pair, rolled_up)
+        promoted_through = quarter_meta.get("promoted_through")
+        if promoted_through is not None and promoted_through != minute_meta.get("promoted_through"):
+            rows = [r for r in rows if r["bucket"] > promoted_through]
+            minute_meta["promoted_through"] = promoted_through
+            minutes.save(minute_meta, rows)
+
+        compacted = 0
+        for batch_id, records in self.store.expired(pair, now - self.raw_max_age):
+            if rolled_up is not None and batch_id <= rolled_up:
+                self.store.drop(pair, batch_id)
+                continue
+            ticks = [r for r in (_tick_rollup(rec, MINUTE) for rec in records) if r is not None]
+            rows = _add(rows, bucketize(ticks, MINUTE))
+            minute_meta["rolled_up"] = rolled_up = batch_id
+            minutes.save(minute_meta, rows)
+            self.store.drop(pair, batch_id)
+            compacted += len(records)
+
+        promoted = 0
+        # Only promote whole 15-minute buckets, so later minutes never split one
+        cutoff = _bucket_start(now - self.minute_max_age, QUARTER_HOUR)
+        old = [r for r in rows if r["bucket"] < cutoff]
+        if old:
+            quarter_meta["promoted_through"] = minute_meta["promoted_through"] = old[-1]["bucket"]
+            quarters.save(quarter_meta, _add(quarter_rows, bucketize(old, QUARTER_HOUR)))
+            minutes.save(minute_meta, rows[len(old):])
+            promoted = len(old)
+
+        columns = self.columns(pair) if self.columns else None
+        trimmed = columns.trim(now - self.raw_max_age) if columns is not None else 0
+        return compacted, promoted, trimmed
+
+    def sweep_blobs(self, now=None):
+        """Remove blobs that no raw tick left in the store references; returns how many."""
+        now = time.time() if now is None else now
+        live = set()
+        for pair in self.store.pairs():
+            for line in self.store.iter_lines(pair):
+                live |= references(line)
+        return self.store.blobs.sweep(live, now - BLOB_GRACE)
+
+    def run_once(self):
+        started = time.monotonic()
+        for pair in self.store.pairs():
+            try:
+                compacted, promoted, trimmed = self.compact_pair(pair)
+            except Exception as e:
+                self.last_error = f"{pair}: {e}"
+                print(f"❌ Compaction of {pair} failed: {e}")
+                continue
+            if compacted or promoted or trimmed:
+                print(f"🧹 Compacted {pair}: {compacted} ticks → 1m, {promoted} 1m buckets → 15m, {trimmed} column rows trimmed")
+            with self._lock:
+                self.compacted_ticks += compacted
+                self.promoted_minutes += promoted
+                self.trimmed_rows += trimmed
+        if self.store.blobs is not None:
+            try:
+                swept = self.sweep_blobs()
+            except Exception as e:
+                swept = 0
+                self.last_error = f"blob sweep: {e}"
+                print(f"❌ Blob sweep failed: {e}")
+            if swept:
+                print(f"🧹 Swept {swept} unreferenced blobs")
+            with self._lock:
+                self.swept_blobs += swept
+        with self._lock:
+            self.runs += 1
+            self.last_run = datetime.now().isoformat()
+            self.last_run_ms = (time.monotonic() - started) * 1000
+
+    def _loop(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"❌ Compaction run failed: {e}")
+            time.sleep(self.every)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, daemon=True)
+                self._thread.start()
+        return self
+
+    def records(self, pair, start=None, end=None):
+        """Compacted history of `pair` overlapping [start, end] (datetimes, ISO strings or epoch seconds) as tick-like records."""
+        start, end = epoch(start), epoch(end)
+        records = []
+        for interval in (QUARTER_HOUR, MINUTE):
+            for row in self.rollup(pair, interval).read():
+                bucket = epoch(row["bucket"])
+                if (start is None or bucket + interval > start) and (end is None or bucket <= end):
+                    records.append(as_record(row))
+        return sorted(records, key=lambda r: r["timestamp"])
+
+    def read(self, pair, interval, start=None, end=None):
+        """Rollups of `pair` at `interval` seconds whose bucket starts within [start, end] (ISO strings)."""
+        rows = self.rollup(pair, interval).read()
+        return [r for r in rows if (start is None or r["bucket"] >= start) and (end is None or r["bucket"] <= end)]
+
+    def status(self):
+        with self._lock:
+            return {
+                "raw_max_age_hours": round(self.raw_max_age / 3600, 2),
+                "minute_max_age_days": round(self.minute_max_age / 86400, 2),
+                "every_seconds": self.every,
+                "runs": self.runs,
+                "compacted_ticks": self.compacted_ticks,
+                "promoted_minutes": self.promoted_minutes,
+                "trimmed_column_rows": self.trimmed_rows,
+                "swept_blobs": self.swept_blobs,
+                "last_run": self.last_run,
+                "last_run_ms": round(self.last_run_ms, 1),
+                "last_error": self.last_error,
+            }
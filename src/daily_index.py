@@ -0,0 +1,88 @@
+import json
+import os
+import re
+import threading
+
+# Cross-pair daily index.
+#
+# Instead of writing every tick a second time into data_<YYYYMMDD>.json, each
+# tick adds one small line to daily/<YYYYMMDD>.idx:
+#     {"pair": ..., "seg": ..., "off": ..., "ts": ...}
+# pointing at where the record already lives in its pair store (seg/off are
+# null for backends without byte locations, e.g. SQLite, which are read by
+# time range instead). Date retrieval reads the index and fetches the records
+# from the pair stores; retention deletes whole days of index. Legacy full
+# data_<YYYYMMDD>.json files are still read and expired alongside.
+
+KEEP_DAYS = 7
+_LEGACY_RE = re.compile(r"^data_(\d{8})\.json$")
+_INDEX_RE = re.compile(r"^(\d{8})\.idx$")
+
+
+class DailyIndex:
+    def __init__(self, directory, legacy_dir, keep_days=KEEP_DAYS):
+        self.directory = directory
+        self.legacy_dir = legacy_dir
+        self.keep_days = keep_days
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def index_path(self, day):
+        return self.directory / f"{day}.idx"
+
+    def legacy_path(self, day):
+        return self.legacy_dir / f"data_{day}.json"
+
+    @staticmethod
+    def day_of(timestamp):
+        """YYYYMMDD of an ISO timestamp."""
+        return str(timestamp)[:10].replace("-", "")
+
+    def append(self, entries, sync=None):
+        """Add (pair, location or None, timestamp) entries; `sync(fileobj)` flushes and fsyncs if given."""
+        by_day = {}
+        for pair, location, timestamp in entries:
+            seg, off = (location[0], location[1]) if location else (None, None)
+            line = json.dumps({"pair": pair, "seg": seg, "off": off, "ts": timestamp}) + "\n"
+            by_day.setdefault(self.day_of(timestamp), []).append(line)
+        with self._lock:
+            for day, lines in by_day.items():
+                with open(self.index_path(day), "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+                    if sync:
+                        sync(f)
+
+    def entries(self, day):
+        path = self.index_path(day)
+        if not os.path.exists(path):
+            return []
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except Exception:
+                    continue  # torn last line
+        return entries
+
+    def days(self):
+        """Every day with an index or a legacy daily file, oldest first."""
+        days = set()
+        for name in os.listdir(self.directory):
+            match = _INDEX_RE.match(name)
+            if match:
+                days.add(match.group(1))
+        for name in os.listdir(self.legacy_dir):
+            match = _LEGACY_RE.match(name)
+            if match:
+                days.add(match.group(1))
+        return sorted(days)
+
+    def cleanup(self):
+        """Keep the newest `keep_days` days; drop older index files and legacy daily files."""
+        expired = self.days()[:-self.keep_days] if self.keep_days else []
+        for day in expired:
+            for path in (self.index_path(day), self.legacy_path(day)):
+                if os.path.exists(path):
+                    os.unlink(path)
+        return expired
@@ -0,0 +1,54 @@
+import threading
+import traceback
+
+# In-process publish/subscribe bus for tick data.
+#
+# The fetcher publishes each tick's result once; persistence, the socket emit,
+# view stats and exit checks subscribe to it instead of fetching again.
+
+
+class DataBus:
+    def __init__(self):
+        self._subscribers = {}
+        self._latest = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic, handler):
+        """Call `handler(payload)` for every message published on `topic`, in subscription order."""
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(handler)
+        return handler
+
+    def unsubscribe(self, topic, handler):
+        with self._lock:
+            handlers = self._subscribers.get(topic, [])
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def publish(self, topic, payload):
+        """Store `payload` as the latest value of `topic` and deliver it to every subscriber.
+
+        A failing subscriber is logged and skipped so it cannot starve the others.
+        """
+        with self._lock:
+            self._latest[topic] = payload
+            self._versions[topic] = self._versions.get(topic, 0) + 1
+            version = self._versions[topic]
+            handlers = list(self._subscribers.get(topic, []))
+        for handler in handlers:
+            try:
+                handler(payload)
+            except Exception as e:
+                print(f"❌ Data bus subscriber {getattr(handler, '__name__', handler)} failed on '{topic}': {e}")
+                traceback.print_exc()
+        return version
+
+    def latest(self, topic, default=None):
+        return self._latest.get(topic, default)
+
+    def version(self, topic):
+        return self._versions.get(topic, 0)
+
+
+tick_bus = DataBus()
@@ -27,6 +27,28 @@ interface RealTimeData {
 
 const STORAGE_KEY = "realTimeData";
 const ACTIVE_CONTRACT_KEY = "activeContract";
+const DASHBOARD_PANELS = [
+  "marketcap", "holders", "buys-sells", "wallet-age", "social", "metrics",
+  "data", "tokeninfo", "twitter-search", "x-data"
+];
+// State fields each dashboard panel fills in
+const PANEL_STATE_KEYS: Record<string, (keyof RealTimeData)[]> = {
+  marketcap: ["marketCap"],
+  holders: ["holders"],
+  "buys-sells": ["buysSells"],
+  "wallet-age": ["walletAge"],
+  social: ["social"],
+  metrics: ["metrics"],
+  data: ["data", "stats"],
+  tokeninfo: ["tokeninfo"],
+  "twitter-search": ["twitterSearch"],
+  "x-data": ["x_data_type", "key"]
+};
+
+// A panel that failed on the server comes back as {"error": "..."} while the others still arrive
+const isPanelError = (value: any) =>
+  Boolean(value) && typeof value === "object" && !Array.isArray(value) &&
+  Object.keys(value).length === 1 && "error" in value;
 
 type Options = {
   baseUrl?: string;           // e.g. "http://localhost:5050"
@@ -106,21 +128,15 @@ export default function useRealTimeData(opts?: Options) {
   const fetchAll = useCallback(async (showLoader = false) => {
     if (showLoader) setIsLoading(true);
     try {
-      const [
-        marketCap, holders, buysSells, walletAge, social, metrics,
-        dataResp, tokeninfo, twitterSearch, xDataResp
-      ] = await Promise.all([
-        fetchJson("marketcap"),
-        fetchJson("holders"),
-        fetchJson("buys-sells"),
-        fetchJson("wallet-age"),
-        fetchJson("social"),
-        fetchJson("metrics"),
-        fetchJson("data"),
-        fetchJson("tokeninfo"),
-        fetchJson("twitter-search"),
-        fetchJson("x-data")
-      ]);
+      // One batched request: every panel comes from the same server-side snapshot
+      const dashboard = await fetchJson(`dashboard?fields=${DASHBOARD_PANELS.join(",")}`);
+      if (!dashboard) throw new Error("GET dashboard failed");
+      const failed = DASHBOARD_PANELS.filter((panel) => isPanelError(dashboard[panel]));
+      failed.forEach((panel) => console.error(`Error fetching ${panel}`, dashboard[panel].error));
+      const {
+        marketcap: marketCap, holders, "buys-sells": buysSells, "wallet-age": walletAge, social, metrics,
+        data: dataResp, tokeninfo, "twitter-search": twitterSearch, "x-data": xDataResp
+      } = dashboard;
 
       const twitterSearchNormalized = (twitterSearch && typeof twitterSearch === "object")
         ? {
@@ -169,8 +185,17 @@ export default function useRealTimeData(opts?: Options) {
         lastUpdate: new Date().toISOString()
       };
 
-      setData(newState);
-      localStorage.setItem(STORAGE_KEY, JSON.stringify(newState));
+      setData((prev) => {
+        // Failed panels keep their last good value; the rest update
+        const merged: RealTimeData = { ...newState };
+        failed.forEach((panel) => {
+          PANEL_STATE_KEYS[panel].forEach((key) => {
+            (merged as any)[key] = prev[key];
+          });
+        });
+        localStorage.setItem(STORAGE_KEY, JSON.stringify(merged));
+        return merged;
+      });
       setError(null);
     } catch (e) {
       console.error("fetchAll failed", e);
@@ -0,0 +1,169 @@
+import http.cookiejar
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from circuit_breaker import CircuitOpenError, get_breaker
+from singleflight import SingleFlight
+
+# Shared HTTP client for every upstream fetcher (Axiom, Alpha.ai, X, CoinGecko).
+#
+# One requests.Session per host keeps a warm urllib3 pool, so a tick reuses
+# open TCP+TLS connections instead of handshaking on every call. requests has
+# no HTTP/2 support; keep-alive pooling is what removes the handshake cost.
+
+POOL_CONNECTIONS = 4   # distinct pools kept per session (one per scheme/host/port)
+POOL_MAXSIZE = 8       # concurrent keep-alive connections per host
+
+
+class _NoPersistCookiePolicy(http.cookiejar.DefaultCookiePolicy):
+    """Keep sessions stateless: callers pass their own cookies per request."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+_sessions = {}
+_request_counts = {}
+_lock = threading.Lock()
+get_flight = SingleFlight()
+
+
+def _host_of(url):
+    parts = urlsplit(url)
+    return parts.netloc or url
+
+
+def session_for(url):
+    """Return the pooled keep-alive session for the host of `url`."""
+    host = _host_of(url)
+    session = _sessions.get(host)
+    if session is not None:
+        return session
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            session.cookies.set_policy(_NoPersistCookiePolicy())
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+            _request_counts[host] = {"requests": 0, "coalesced": 0, "total_ms": 0.0, "last_ms": 0.0}
+    return session
+
+
+# Families whose 429s are per account/operation budgets (handled by the rate
+# limiter and account pool), not a sign the whole upstream is down
+PER_ACCOUNT_RATE_LIMITS = {"x"}
+
+
+def _is_upstream_failure(resp, breaker=None):
+    if resp.status_code == 429:
+        return breaker not in PER_ACCOUNT_RATE_LIMITS
+    return resp.status_code >= 500
+
+
+def flight_key(method, url, params=None):
+    """Identity of a request for coalescing: method, url and (sorted) query params."""
+    if isinstance(params, dict):
+        params = tuple(sorted((k, str(v)) for k, v in params.items()))
+    elif params is not None:
+        params = str(params)
+    return (method.upper(), url, params)
+
+
+def request(method, url, breaker=None, **kwargs):
+    """Issue a request through the pooled session for the url's host.
+
+    Identical GETs already in flight are coalesced into a single network call
+    whose response is shared by every caller.
+
+    `breaker` names the circuit breaker of the upstream family; while it is open
+    the call fails fast with CircuitOpenError instead of touching the network.
+    """
+    if method.upper() == "GET":
+        resp, shared = get_flight.do(flight_key(method, url, kwargs.get("params")), _send, method, url, breaker, **kwargs)
+        if shared:
+            with _lock:
+                _request_counts[_host_of(url)]["coalesced"] += 1
+        return resp
+    return _send(method, url, breaker, **kwargs)
+
+
+def _send(method, url, breaker=None, **kwargs):
+    cb = get_breaker(breaker) if breaker else None
+    if cb is not None and not cb.allow():
+        raise CircuitOpenError(f"circuit '{breaker}' is open, skipping {_host_of(url)}")
+
+    session = session_for(url)
+    host = _host_of(url)
+    started = time.monotonic()
+    try:
+        resp = session.request(method, url, **kwargs)
+    except Exception as e:
+        if cb is not None:
+            cb.record_failure(e)
+        raise
+    else:
+        if cb is not None:
+            if _is_upstream_failure(resp, breaker):
+                cb.record_failure(f"HTTP {resp.status_code}")
+            elif resp.status_code == 429:
+                # A per-account limit: neither success nor failure, but a half-open trial is over
+                cb.release_trial()
+            else:
+                cb.record_success()
+        return resp
+    finally:
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with _lock:
+            counts = _request_counts[host]
+            counts["requests"] += 1
+            counts["total_ms"] += elapsed_ms
+            counts["last_ms"] = elapsed_ms
+
+
+def get(url, **kwargs):
+    """Drop-in replacement for requests.get that goes through the pool."""
+    return request("GET", url, **kwargs)
+
+
+def _pool_connection_count(session):
+    """Number of TCP connections urllib3 has opened for this session."""
+    opened = 0
+    for adapter in set(session.adapters.values()):
+        pools = getattr(adapter, "poolmanager", None)
+        if pools is None:
+            continue
+        for key in list(pools.pools.keys()):
+            pool = pools.pools.get(key)
+            if pool is not None:
+                opened += getattr(pool, "num_connections", 0)
+    return opened
+
+
+def connection_stats():
+    """Per-host request and connection counts, with the keep-alive reuse ratio."""
+    stats = {}
+    with _lock:
+        hosts = list(_sessions.items())
+        counts = {host: dict(c) for host, c in _request_counts.items()}
+    for host, session in hosts:
+        c = counts.get(host, {})
+        requests_made = c.get("requests", 0)
+        connections = _pool_connection_count(session)
+        reused = max(requests_made - connections, 0)
+        stats[host] = {
+            "requests": requests_made,
+            "coalesced": c.get("coalesced", 0),
+            "connections_opened": connections,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / requests_made, 3) if requests_made else 0.0,
+            "avg_ms": round(c.get("total_ms", 0.0) / requests_made, 1) if requests_made else 0.0,
+            "last_ms": round(c.get("last_ms", 0.0), 1),
+        }
+    return stats
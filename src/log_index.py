@@ -0,0 +1,141 @@
+import json
+import os
+import struct
+import threading
+
+from timestamps import line_epoch
+
+# Append-maintained offset index for the JSONL pair logs.
+#
+# The sidecar <pair>.idx holds one fixed-size entry per complete record:
+# (byte offset, epoch seconds of its timestamp). "Last N records" is then a
+# single seek to the N-th last offset instead of reading the whole log. Only the
+# offsets are kept in memory. The index only ever covers complete lines: a
+# trailing fragment without "\n" (a write torn by a crash) is reported via
+# `torn` and left out until the writer terminates it.
+
+ENTRY = struct.Struct("<Qd")
+
+
+class LogIndex:
+    def __init__(self, log_path, index_path=None):
+        self.log_path = log_path
+        self.index_path = index_path or log_path.with_suffix(".idx")
+        self.offsets = []
+        self.indexed_to = 0         # log bytes covered by the index (end of last complete line)
+        self.torn = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raw = b""
+        usable = len(raw) - len(raw) % ENTRY.size
+        entries = [ENTRY.unpack_from(raw, i) for i in range(0, usable, ENTRY.size)]
+
+        size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        if entries and entries[-1][0] >= size:
+            print(f"⚠️ Index {self.index_path.name} points past the end of its log, rebuilding")
+            entries = []
+        if entries:
+            # The last indexed line must still be a record; otherwise the log was rewritten
+            with open(self.log_path, "rb") as f:
+                f.seek(entries[-1][0])
+                last = f.readline()
+            if not last.endswith(b"\n") or line_epoch(last) is None:
+                print(f"⚠️ Index {self.index_path.name} does not match its log, rebuilding")
+                entries = []
+            else:
+                self.indexed_to = entries[-1][0] + len(last)
+        if len(entries) * ENTRY.size != len(raw):
+            self._rewrite(entries)
+        self.offsets = [e[0] for e in entries]
+        self.refresh()
+
+    def _rewrite(self, entries):
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            for entry in entries:
+                f.write(ENTRY.pack(*entry))
+        os.replace(tmp, self.index_path)
+
+    def refresh(self):
+        """Index any complete lines appended since the last call; cheap when nothing changed."""
+        with self._lock:
+            try:
+                size = os.path.getsize(self.log_path)
+            except FileNotFoundError:
+                return
+            if size < self.indexed_to:
+                # Truncated underneath us; start over
+                self.offsets, self.indexed_to = [], 0
+                self._rewrite([])
+            if size == self.indexed_to:
+                self.torn = False
+                return
+            new_entries = []
+            with open(self.log_path, "rb") as f:
+                f.seek(self.indexed_to)
+                offset = self.indexed_to
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    ts = line_epoch(line)
+                    if ts is not None:
+                        new_entries.append((offset, ts))
+                    offset += len(line)
+            self.torn = offset < size
+            self.indexed_to = offset
+            if new_entries:
+                with open(self.index_path, "ab") as f:
+                    for entry in new_entries:
+                        f.write(ENTRY.pack(*entry))
+                self.offsets.extend(e[0] for e in new_entries)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _read_from(self, start, end):
+        with open(self.log_path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def tail(self, n):
+        """The last `n` complete records, oldest first."""
+        self.refresh()
+        with self._lock:
+            if not self.offsets or n <= 0:
+                return []
+            offsets = self.offsets[-n:]
+            end = self.indexed_to
+        chunk = self._read_from(offsets[0], end)
+        records = []
+        base = offsets[0]
+        for i, start in enumerate(offsets):
+            stop = offsets[i + 1] if i + 1 < len(offsets) else end
+            try:
+                # Slice up to the first newline: skipped junk lines may sit between records
+                records.append(json.loads(chunk[start - base:stop - base].split(b"\n", 1)[0]))
+            except Exception:
+                continue
+        return records
+
+    def latest(self):
+        records = self.tail(1)
+        return records[0] if records else {}
+
+
+_indexes = {}
+_registry_lock = threading.Lock()
+
+
+def index_for(log_path):
+    """Shared LogIndex for a log file, opened (and caught up) on first use."""
+    with _registry_lock:
+        index = _indexes.get(log_path)
+        if index is None:
+            index = _indexes[log_path] = LogIndex(log_path)
+        return index
@@ -5,9 +5,11 @@ from urllib.parse import quote
 import sys
 import os
 
+from x_accounts import DEFAULT_AUTH_TOKEN, DEFAULT_CT0, DEFAULT_TWID
+from x_client import x_get
+
 class TwitterSearchAPI:
     def __init__(self, auth_token, ct0, twid):
-        self.session = requests.Session()
         self.base_url = "https://x.com/i/api/graphql/4gROUrdRVzZmO2n_S-DKlA/SearchTimeline"
         
         # Set headers from the request
@@ -46,10 +48,6 @@ class TwitterSearchAPI:
             'lang': 'en',
             'dnt': '1'
         }
-        
-        # Update session cookies
-        for key, value in self.cookies.items():
-            self.session.cookies.set(key, value)
 
     def build_search_params(self, raw_query, count=20, product="Top"):
         """Build the parameters for the search request"""
@@ -115,24 +113,18 @@ class TwitterSearchAPI:
         params = self.build_search_params(query, count, product)
         
         try:
-            response = self.session.get(
+            # Never sleeps: without a permit this raises RateLimitedError and the
+            # caller keeps its cached metrics until the budget refills
+            response = x_get(
                 self.base_url,
                 params=params,
                 headers=self.headers,
+                cookies=self.cookies,
                 timeout=30
             )
             
-            # Check rate limiting
             if 'x-rate-limit-remaining' in response.headers:
-                remaining = int(response.headers['x-rate-limit-remaining'])
-                reset_time = int(response.headers['x-rate-limit-reset'])
-                print(f"Rate limit: {remaining} requests remaining")
-                
-                if remaining == 0:
-                    wait_time = reset_time - int(time.time())
-                    print(f"Rate limit exceeded. Waiting {wait_time} seconds")
-                    time.sleep(max(wait_time, 1))
-                    return self.search_timeline(query, count, product)
+                print(f"Rate limit: {response.headers['x-rate-limit-remaining']} requests remaining")
             
             response.raise_for_status()
             return response.json()
@@ -234,11 +226,7 @@ def continuous_fetch(query, interval=20):
             import codecs
             sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer)
     
-    auth_token = "84c79d35cb2a902f89168422691d42a685e810cb"
-    ct0 = "61f38a6545d11663e819f9f141229a157b4da9742e66762cb54e799b149de7d6ea6d327683a4ab7d5a59ee4f8841dd5395e95aaeefdca7847794a5df46ecb2a24c88a47849d6ef6e4f41e2c110e06232"
-    twid = "u%3D1919992237397835776"
-    
-    api = TwitterSearchAPI(auth_token, ct0, twid)
+    api = TwitterSearchAPI(DEFAULT_AUTH_TOKEN, DEFAULT_CT0, DEFAULT_TWID)
     
     print("Starting continuous fetch for query:", query)
     print("Refresh interval:", interval, "seconds")
@@ -312,10 +300,7 @@ if __name__ == "__main__":
     main()
 
 # Make the API instance available for import
-DEFAULT_AUTH_TOKEN = "84c79d35cb2a902f89168422691d42a685e810cb"
-DEFAULT_CT0 = "61f38a6545d11663e819f9f141229a157b4da9742e66762cb54e799b149de7d6ea6d327683a4ab7d5a59ee4f8841dd5395e95aaeefdca7847794a5df46ecb2a24c88a47849d6ef6e4f41e2c110e06232"
-DEFAULT_TWID = "u%3D1919992237397835776"
-
+# (requests are signed by the X account pool; these are only the fallback account)
 twitter_search_api = TwitterSearchAPI(
     auth_token=DEFAULT_AUTH_TOKEN,
     ct0=DEFAULT_CT0,
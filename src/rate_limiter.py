@@ -0,0 +1,148 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+# Non-blocking token-bucket limiter for X GraphQL endpoints.
+#
+# Every X response feeds its x-rate-limit-* headers back into the bucket of its
+# account and GraphQL operation (CommunityTweetsTimeline, UserTweets, SearchTimeline, ...).
+# The refill rate is the remaining budget spread evenly over what is left of the
+# reset window, so the budget lasts the whole window instead of being burned in
+# the first minute. Callers never sleep: without a permit they get
+# RateLimitedError and fall back to their cached value.
+
+DEFAULT_BURST = 2           # permits a bucket can bank
+DEFAULT_RATE = 1.0          # permits/second before an endpoint has reported its limits
+EXHAUSTED_RETRY = 60        # seconds to back off after a 429 that carried no reset header
+
+
+class RateLimitedError(requests.exceptions.RequestException):
+    """Raised instead of calling an X endpoint that has no permit available."""
+
+
+class TokenBucket:
+    def __init__(self, burst=DEFAULT_BURST, rate=DEFAULT_RATE):
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.rate = rate
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None        # epoch seconds of the server-side window reset
+        self.updated = time.monotonic()
+        self.granted = 0
+        self.denied = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.reset_at is not None and time.time() >= self.reset_at:
+            # The server window rolled over; allow traffic until fresh headers arrive
+            self.reset_at = None
+            self.remaining = self.limit
+            self.rate = DEFAULT_RATE
+            self.tokens = max(self.tokens, 1.0)
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.granted += 1
+            return True
+        self.denied += 1
+        return False
+
+    def wait_time(self):
+        """Seconds until the next permit, without taking it."""
+        self._refill()
+        if self.tokens >= 1.0:
+            return 0.0
+        if self.rate <= 0:
+            return max((self.reset_at or time.time()) - time.time(), 0.0)
+        return (1.0 - self.tokens) / self.rate
+
+    def update(self, remaining, reset_at, limit=None):
+        self._refill()
+        now = time.time()
+        self.remaining = remaining
+        self.reset_at = reset_at
+        if limit is not None:
+            self.limit = limit
+        window = max(reset_at - now, 1.0)
+        self.rate = remaining / window
+        self.capacity = max(1.0, min(float(DEFAULT_BURST), float(remaining)))
+        # Never bank more permits than the server says are left
+        self.tokens = min(self.tokens, float(remaining), self.capacity)
+
+    def status(self):
+        self._refill()
+        return {
+            "tokens": round(self.tokens, 2),
+            "rate_per_min": round(self.rate * 60, 2),
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_in_seconds": round(max(self.reset_at - time.time(), 0), 1) if self.reset_at else None,
+            "granted": self.granted,
+            "denied": self.denied,
+        }
+
+
+class XRateLimiter:
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(url):
+        """GraphQL operation name of an X url (last path segment); buckets are per account and operation."""
+        return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1] or "x"
+
+    def _bucket(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket()
+        return bucket
+
+    def try_acquire(self, key):
+        """Take a permit for `key` if one is available; never blocks."""
+        with self._lock:
+            return self._bucket(key).try_acquire()
+
+    def wait_time(self, key):
+        with self._lock:
+            return self._bucket(key).wait_time()
+
+    def headroom(self, key):
+        """Sort key for picking between buckets: permit available, then server-side budget left."""
+        with self._lock:
+            bucket = self._bucket(key)
+            bucket._refill()
+            remaining = bucket.remaining if bucket.remaining is not None else float("inf")
+            return (bucket.tokens >= 1.0, remaining, bucket.tokens)
+
+    def update_from_response(self, key, resp):
+        """Feed x-rate-limit-* headers (and 429s) from any X response back into the bucket."""
+        headers = resp.headers
+        with self._lock:
+            bucket = self._bucket(key)
+            if "x-rate-limit-remaining" in headers and "x-rate-limit-reset" in headers:
+                try:
+                    remaining = int(headers["x-rate-limit-remaining"])
+                    reset_at = int(headers["x-rate-limit-reset"])
+                    limit = int(headers["x-rate-limit-limit"]) if "x-rate-limit-limit" in headers else None
+                except ValueError:
+                    return
+                if resp.status_code == 429:
+                    remaining = 0
+                bucket.update(remaining, reset_at, limit)
+            elif resp.status_code == 429:
+                bucket.update(0, int(time.time()) + EXHAUSTED_RETRY)
+
+    def status(self):
+        with self._lock:
+            return {key: bucket.status() for key, bucket in self._buckets.items()}
+
+
+x_rate_limiter = XRateLimiter()
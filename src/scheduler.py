@@ -0,0 +1,151 @@
+import threading
+import time
+
+# Drift-free, adaptive polling schedule for the tick loop.
+#
+# Ticks are placed on a fixed grid (start + k * tick_interval), so a slow fetch
+# does not push every later tick back; slots that have already passed are
+# counted as missed and skipped. Each data source has its own cadence between a
+# min and max interval. The cadence tightens while market cap or volume is
+# moving fast and relaxes while the token is quiet. Activity is only measured
+# from freshly fetched market data and scaled to a per-tick rate, so ticks that
+# reuse cached data do not read as quiet.
+
+LATE_TOLERANCE = 0.25       # seconds after its slot before a tick counts as late
+FAST_CHANGE = 0.02          # >2% move in market cap or volume per tick = busy
+QUIET_CHANGE = 0.002        # <0.2% move = quiet
+MIN_ACTIVITY_FACTOR = 0.5
+MAX_ACTIVITY_FACTOR = 4.0
+
+
+class SourceSchedule:
+    def __init__(self, name, base, min_interval, max_interval, adaptive=True):
+        self.name = name
+        self.base = base
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.adaptive = adaptive
+        self.interval = base
+        self.next_due = 0.0          # monotonic; 0 means due on the first tick
+        self.last_run = None
+        self.runs = 0
+
+    def retune(self, factor):
+        if not self.adaptive:
+            return
+        self.interval = min(max(self.base * factor, self.min_interval), self.max_interval)
+        if self.last_run is not None:
+            # A shorter interval takes effect now rather than after the old slot
+            self.next_due = min(self.next_due, self.last_run + self.interval)
+
+
+class AdaptiveScheduler:
+    def __init__(self, tick_interval, sources):
+        """`sources` maps name -> (base, min_interval, max_interval[, adaptive])."""
+        self.tick_interval = tick_interval
+        self.sources = {name: SourceSchedule(name, *spec) for name, spec in sources.items()}
+        self.activity_factor = 1.0
+        self.next_tick = None
+        self.ticks = 0
+        self.late_ticks = 0
+        self.missed_ticks = 0
+        self.max_lateness = 0.0
+        self._last_market = None
+        self._lock = threading.Lock()
+
+    # --- tick grid ---
+    def begin_tick(self):
+        """Record the start of a tick, counting it as late if it began after its slot."""
+        now = time.monotonic()
+        with self._lock:
+            if self.next_tick is None:
+                self.next_tick = now
+            lateness = now - self.next_tick
+            self.ticks += 1
+            if lateness > LATE_TOLERANCE:
+                self.late_ticks += 1
+                self.max_lateness = max(self.max_lateness, lateness)
+            return now
+
+    def end_tick(self):
+        """Advance to the next free slot on the grid and return how long to sleep until it."""
+        now = time.monotonic()
+        with self._lock:
+            self.next_tick += self.tick_interval
+            if now > self.next_tick:
+                skipped = int((now - self.next_tick) // self.tick_interval) + 1
+                self.missed_ticks += skipped
+                self.next_tick += skipped * self.tick_interval
+            return max(self.next_tick - now, 0.0)
+
+    # --- per-source cadence ---
+    def due(self, now=None):
+        """Names of the sources whose next fetch falls within this tick."""
+        now = time.monotonic() if now is None else now
+        slack = self.tick_interval / 2
+        with self._lock:
+            return {name for name, s in self.sources.items() if s.next_due <= now + slack}
+
+    def mark_fetched(self, name, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            s = self.sources[name]
+            s.runs += 1
+            s.last_run = now
+            s.next_due = max(s.next_due + s.interval, now + s.interval - self.tick_interval / 2)
+
+    def force(self, name):
+        """Make a source due on the next tick (e.g. after the pair changes)."""
+        with self._lock:
+            self.sources[name].next_due = 0.0
+
+    def observe(self, market_cap, volume, now=None):
+        """Retune cadences from how fast market cap and volume moved since the last fresh observation.
+
+        Call only with freshly fetched market data; the change is scaled to a per-tick rate.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            previous = self._last_market
+            self._last_market = (market_cap or 0, volume or 0, now)
+            if previous is None:
+                return
+            elapsed = max(now - previous[2], self.tick_interval)
+            change = max(
+                abs((market_cap or 0) - previous[0]) / max(abs(previous[0]), 1.0),
+                abs((volume or 0) - previous[1]) / max(abs(previous[1]), 1.0),
+            ) * self.tick_interval / elapsed
+            if change >= FAST_CHANGE:
+                self.activity_factor = max(self.activity_factor * 0.5, MIN_ACTIVITY_FACTOR)
+            elif change <= QUIET_CHANGE:
+                self.activity_factor = min(self.activity_factor * 1.25, MAX_ACTIVITY_FACTOR)
+            for s in self.sources.values():
+                s.retune(self.activity_factor)
+
+    def reset_activity(self):
+        with self._lock:
+            self._last_market = None
+            self.activity_factor = 1.0
+            for s in self.sources.values():
+                s.retune(self.activity_factor)
+                s.next_due = 0.0
+
+    def status(self):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "tick_interval": self.tick_interval,
+                "activity_factor": round(self.activity_factor, 2),
+                "ticks": self.ticks,
+                "late_ticks": self.late_ticks,
+                "missed_ticks": self.missed_ticks,
+                "max_lateness_seconds": round(self.max_lateness, 2),
+                "sources": {
+                    name: {
+                        "interval": round(s.interval, 1),
+                        "next_in_seconds": round(max(s.next_due - now, 0), 1),
+                        "runs": s.runs,
+                    }
+                    for name, s in self.sources.items()
+                },
+            }
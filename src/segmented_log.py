@@ -0,0 +1,267 @@
+import gzip
+import json
+import os
+import threading
+
+from eventlet import tpool
+
+from timestamps import epoch, line_epoch, record_epoch
+
+# Segmented pair log: data/<pair>.json is the active segment, sealed segments are
+# gzip-compressed under data/segments/<pair>/.
+#
+# Once the active file passes SEGMENT_BYTES it is sealed: compressed to
+# <seq>.jsonl.gz, recorded in manifest.json with its time range and record
+# count, and truncated. The decompressed bytes of a sealed segment are exactly
+# the old active file, so a (segment, offset) position stays valid across a
+# seal. Readers only decompress the segments whose time range overlaps a query.
+# Compression runs on a native thread (eventlet tpool) outside the log lock, so
+# sealing a segment never stalls the hub.
+
+SEGMENT_BYTES = 4 * 1024 * 1024
+
+
+def _pack(data):
+    """(gzip of `data`, epoch seconds of each record in it)."""
+    times = [t for t in (line_epoch(line) for line in data.splitlines()) if t is not None]
+    return gzip.compress(data, 6), times
+
+
+class SegmentedLog:
+    def __init__(self, active_path, segment_dir, segment_bytes=SEGMENT_BYTES):
+        self.active_path = active_path
+        self.segment_dir = segment_dir
+        self.segment_bytes = segment_bytes
+        self.manifest_path = segment_dir / "manifest.json"
+        self._lock = threading.RLock()
+        self.manifest = {"active_seq": 0, "segments": []}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+            self._finish_interrupted_seal()
+
+    @property
+    def active_seq(self):
+        return self.manifest["active_seq"]
+
+    @property
+    def segments(self):
+        return self.manifest["segments"]
+
+    def _write_manifest(self):
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp, self.manifest_path)
+
+    def _finish_interrupted_seal(self):
+        """Truncate an active file that was sealed but not yet emptied when the process died."""
+        if not self.segments or not os.path.exists(self.active_path):
+            return
+        last = self.segments[-1]
+        if os.path.getsize(self.active_path) < last["bytes"]:
+            return
+        with open(self.active_path, "rb") as f:
+            first = f.readline()
+        if line_epoch(first) == last["first_ts"]:
+            with open(self.active_path, "r+b") as f:
+                f.seek(last["bytes"])
+                rest = f.read()
+                f.seek(0)
+                f.write(rest)
+                f.truncate()
+            print(f"♻️ Finished sealing segment {last['seq']} of {self.active_path.name}")
+
+    # --- writing ---
+    def maybe_rotate(self):
+        """Seal the active file if it has grown past the segment size. Returns True if it did."""
+        try:
+            size = os.path.getsize(self.active_path)
+        except FileNotFoundError:
+            return False
+        if size < self.segment_bytes:
+            return False
+        self.seal()
+        return True
+
+    def seal(self):
+        with self._lock:
+            seq = self.active_seq
+            with open(self.active_path, "rb") as f:
+                data = f.read()
+        end = data.rfind(b"\n") + 1     # a torn fragment stays in the active file
+        if end == 0:
+            return
+        data = data[:end]
+        compressed, times = tpool.execute(_pack, data)
+        with self._lock:
+            if self.active_seq != seq:
+                return                  # sealed by someone else meanwhile
+            with open(self.active_path, "rb") as f:
+                f.seek(end)
+                rest = f.read()         # the torn fragment, plus anything appended meanwhile
+            self.segment_dir.mkdir(parents=True, exist_ok=True)
+            name = f"{seq:06d}.jsonl.gz"
+            path = self.segment_dir / name
+            tmp = path.with_name(name + ".tmp")
+            with open(tmp, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp, path)
+            self.segments.append({
+                "seq": seq,
+                "file": name,
+                "first_ts": times[0] if times else None,
+                "last_ts": times[-1] if times else None,
+                "records": len(times),
+                "bytes": len(data),
+                "compressed_bytes": os.path.getsize(path),
+            })
+            self.manifest["active_seq"] = seq + 1
+            self._write_manifest()
+            with open(self.active_path, "wb") as f:
+                f.write(rest)
+            print(f"🗜️ Sealed segment {seq} of {self.active_path.name}: "
+                  f"{len(data) // 1024} KB → {os.path.getsize(path) // 1024} KB")
+
+    # --- reading ---
+    def _segment_data(self, segment):
+        with gzip.open(self.segment_dir / segment["file"], "rb") as f:
+            return f.read()
+
+    def _overlaps(self, segment, start, end):
+        if segment["first_ts"] is None:
+            return False
+        if start is not None and segment["last_ts"] < start:
+            return False
+        if end is not None and segment["first_ts"] > end:
+            return False
+        return True
+
+    def iter_lines(self, start=None, end=None):
+        """Complete lines (bytes, oldest first) of every segment overlapping [start, end], then the active file.
+
+        Lines are not filtered by time; use records_between() for that.
+        """
+        start, end = epoch(start), epoch(end)
+        with self._lock:
+            segments = list(self.segments)
+        for segment in segments:
+            if self._overlaps(segment, start, end):
+                yield from self._segment_data(segment).splitlines(keepends=True)
+        if os.path.exists(self.active_path):
+            with open(self.active_path, "rb") as f:
+                for line in f:
+                    if line.endswith(b"\n"):
+                        yield line
+
+    def records_between(self, start=None, end=None):
+        start, end = epoch(start), epoch(end)
+        for line in self.iter_lines(start, end):
+            try:
+                record = json.loads(line)
+            except Exception:
+                continue
+            ts = record_epoch(record)
+            if ts is None:
+                continue
+            if (start is None or ts >= start) and (end is None or ts <= end):
+                yield record
+
+    def read_lines_at(self, locations):
+        """The lines starting at each (seq, offset), in the order given.
+
+        Locations are grouped by segment: each sealed segment is decompressed once and the active
+        file is opened once and read in offset order. Lines of compacted segments are left out.
+        """
+        with self._lock:
+            sealed = {s["seq"]: s for s in self.segments}
+            active_seq = self.active_seq
+        by_segment = {}
+        for i, (seq, offset) in enumerate(locations):
+            if seq == active_seq or seq in sealed:
+                by_segment.setdefault(seq, []).append((offset, i))
+        found = {}
+        for seq, wanted in by_segment.items():
+            wanted.sort()
+            if seq in sealed:
+                data = self._segment_data(sealed[seq])
+                for offset, i in wanted:
+                    end = data.find(b"\n", offset)
+                    found[i] = data[offset:end + 1 if end >= 0 else len(data)]
+            else:
+                with open(self.active_path, "rb") as f:
+                    for offset, i in wanted:
+                        f.seek(offset)
+                        found[i] = f.readline()
+        return [found[i] for i in sorted(found)]
+
+    def expired_segments(self, cutoff):
+        """Sealed segments whose newest record is older than `cutoff` (epoch seconds), oldest first."""
+        with self._lock:
+            return [s for s in self.segments if s["last_ts"] is not None and s["last_ts"] < cutoff]
+
+    def segment_lines(self, segment):
+        return self._segment_data(segment).splitlines()
+
+    def drop_segment(self, seq):
+        """Remove a sealed segment (after compaction) from the manifest and disk."""
+        with self._lock:
+            segment = next((s for s in self.segments if s["seq"] == seq), None)
+            if segment is None:
+                return
+            self.segments.remove(segment)
+            self.manifest["compacted_records"] = self.manifest.get("compacted_records", 0) + segment["records"]
+            self._write_manifest()
+        try:
+            os.unlink(self.segment_dir / segment["file"])
+        except FileNotFoundError:
+            pass
+
+    def sealed_records(self):
+        with self._lock:
+            return sum(s["records"] for s in self.segments)
+
+    def tail(self, n, active_index):
+        """The last `n` records, taking the active file from its index and older ones from sealed segments."""
+        records = active_index.tail(n)
+        with self._lock:
+            segments = list(self.segments)
+        for segment in reversed(segments):
+            missing = n - len(records)
+            if missing <= 0:
+                break
+            older = []
+            for line in self._segment_data(segment).splitlines()[-missing:]:
+                try:
+                    older.append(json.loads(line))
+                except Exception:
+                    continue
+            records = older + records
+        return records
+
+    def status(self):
+        with self._lock:
+            size = os.path.getsize(self.active_path) if os.path.exists(self.active_path) else 0
+            return {
+                "active_seq": self.active_seq,
+                "active_bytes": size,
+                "sealed_segments": len(self.segments),
+                "sealed_records": sum(s["records"] for s in self.segments),
+                "sealed_bytes": sum(s["bytes"] for s in self.segments),
+                "compressed_bytes": sum(s["compressed_bytes"] for s in self.segments),
+                "compacted_records": self.manifest.get("compacted_records", 0),
+            }
+
+
+_logs = {}
+_registry_lock = threading.Lock()
+
+
+def log_for(data_dir, pair):
+    """Shared SegmentedLog for a pair: active file data/<pair>.json, sealed segments in data/segments/<pair>/."""
+    with _registry_lock:
+        log = _logs.get(pair)
+        if log is None:
+            log = _logs[pair] = SegmentedLog(data_dir / f"{pair}.json", data_dir / "segments" / pair)
+        return log
@@ -0,0 +1,83 @@
+import collections
+import json
+import threading
+
+# Bounded in-memory ring of the most recent tick snapshots for one pair log.
+#
+# The fetcher appends every result it persists, so /api routes can answer
+# "latest" and "last N" from memory. The ring is capped by record count and by
+# the serialized size of the records it holds; it is pre-warmed from the tail of
+# the log on a pair switch. A query the ring cannot fully answer (older data
+# than it holds) returns None and the caller falls back to disk. `version` moves
+# on with every change, so derived views know when to rebuild.
+
+
+class SnapshotRing:
+    def __init__(self, max_count=200, max_bytes=32 * 1024 * 1024):
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.source = None          # log path the buffered snapshots belong to
+        self._records = collections.deque()
+        self._bytes = 0
+        self._covers_all = True     # nothing older than the ring exists on disk
+        self._lock = threading.Lock()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self):
+        while self._records and (len(self._records) > self.max_count or self._bytes > self.max_bytes):
+            _, size = self._records.popleft()
+            self._bytes -= size
+            self._covers_all = False
+
+    def warm(self, source, records, total):
+        """Replace the contents with `records` (oldest first) from `source`, which holds `total` records."""
+        with self._lock:
+            self.source = source
+            self._records.clear()
+            self._bytes = 0
+            for record in records:
+                size = len(json.dumps(record, ensure_ascii=False))
+                self._records.append((record, size))
+                self._bytes += size
+            self._covers_all = len(self._records) >= total
+            self._evict()
+            self.version += 1
+
+    def append(self, record, size):
+        """Add a snapshot; `size` is its serialized length in bytes."""
+        with self._lock:
+            self._records.append((record, size))
+            self._bytes += size
+            self._evict()
+            self.version += 1
+
+    def latest(self):
+        with self._lock:
+            return self._records[-1][0] if self._records else {}
+
+    def tail(self, n):
+        """The last `n` snapshots, oldest first, or None if the ring does not reach back that far."""
+        with self._lock:
+            if n > len(self._records) and not self._covers_all:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if n >= len(self._records):
+                return [r for r, _ in self._records]
+            return [r for r, _ in list(self._records)[-n:]]
+
+    def status(self):
+        with self._lock:
+            return {
+                "source": str(self.source) if self.source else None,
+                "version": self.version,
+                "records": len(self._records),
+                "bytes": self._bytes,
+                "max_count": self.max_count,
+                "max_bytes": self.max_bytes,
+                "covers_all": self._covers_all,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,110 @@
+import json
+import threading
+
+# Delta-encoded Socket.IO updates.
+#
+# Rather than broadcasting the whole tick result, the server keeps the last
+# state it emitted on each channel and sends only what changed, as JSON-patch
+# style operations:
+#     data_delta    {"channel", "seq", "base", "ops": [{"op": "replace"|"add"|"remove", "path": "/a/b", "value": ...}]}
+# Dicts are diffed key by key; lists and scalars are replaced whole. Every
+# KEYFRAME_EVERY ticks (and to any client that asks with "resync" or has just
+# subscribed) the full state goes out instead:
+#     data_keyframe {"channel", "seq", "data"}
+# A client applies a delta only if its base is the seq it last saw; otherwise it
+# asks for a resync.
+
+KEYFRAME_EVERY = 20
+
+
+def _pointer(path):
+    return "".join("/" + str(key).replace("~", "~0").replace("/", "~1") for key in path)
+
+
+def diff(old, new, path=()):
+    """JSON-patch style operations turning `old` into `new`."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path + (key,)), "value": value})
+            elif old[key] != value:
+                ops.extend(diff(old[key], value, path + (key,)))
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path + (key,))})
+        return ops
+    if old == new:
+        return []
+    return [{"op": "replace", "path": _pointer(path), "value": new}]
+
+
+class DeltaEmitter:
+    def __init__(self, emit, keyframe_every=KEYFRAME_EVERY):
+        self.emit = emit            # emit(event, payload, to=None)
+        self.keyframe_every = keyframe_every
+        self._channels = {}         # channel -> {"seq", "state", "text"}
+        self._lock = threading.Lock()
+        self.keyframes = 0
+        self.deltas = 0
+        self.resyncs = 0
+        self.keyframe_bytes = 0
+        self.delta_bytes = 0
+        self.last_delta_bytes = 0
+        self.last_full_bytes = 0
+
+    def publish(self, channel, result, to=None):
+        """Send `result` to `to` (a room, or everyone) as a delta against the last state on `channel`, or a keyframe."""
+        # A JSON round trip gives a private copy (later ticks may mutate shared source objects) in wire form
+        text = json.dumps(result, ensure_ascii=False, default=str)
+        state = json.loads(text)
+        with self._lock:
+            previous = self._channels.get(channel)
+            seq = previous["seq"] + 1 if previous else 0
+            self._channels[channel] = {"seq": seq, "state": state, "text": text}
+            keyframe = previous is None or seq % self.keyframe_every == 0
+            ops = None if keyframe else diff(previous["state"], state)
+        if keyframe:
+            payload = {"channel": channel, "seq": seq, "data": state}
+            self._count_keyframe(len(text))
+            self.emit("data_keyframe", payload, to=to)
+            return
+        payload = {"channel": channel, "seq": seq, "base": seq - 1, "ops": ops}
+        size = len(json.dumps(payload, ensure_ascii=False, default=str))
+        with self._lock:
+            self.deltas += 1
+            self.delta_bytes += size
+            self.last_delta_bytes = size
+            self.last_full_bytes = len(text)
+        self.emit("data_delta", payload, to=to)
+
+    def _count_keyframe(self, size):
+        with self._lock:
+            self.keyframes += 1
+            self.keyframe_bytes += size
+            self.last_full_bytes = size
+
+    def resync(self, channel, to):
+        """Send the current state of `channel` as a keyframe to one client (its sid)."""
+        with self._lock:
+            current = self._channels.get(channel)
+            if current is None:
+                return False
+            payload = {"channel": channel, "seq": current["seq"], "data": json.loads(current["text"])}
+            self.resyncs += 1
+        self.emit("data_keyframe", payload, to=to)
+        return True
+
+    def status(self):
+        with self._lock:
+            return {
+                "channels": {channel: c["seq"] for channel, c in self._channels.items()},
+                "keyframe_every": self.keyframe_every,
+                "keyframes": self.keyframes,
+                "deltas": self.deltas,
+                "resyncs": self.resyncs,
+                "avg_keyframe_bytes": round(self.keyframe_bytes / self.keyframes) if self.keyframes else 0,
+                "avg_delta_bytes": round(self.delta_bytes / self.deltas) if self.deltas else 0,
+                "last_delta_bytes": self.last_delta_bytes,
+                "last_full_bytes": self.last_full_bytes,
+            }
@@ -0,0 +1,94 @@
+import threading
+
+# Socket.IO rooms per pair and panel.
+#
+# Clients "subscribe" with {"pair": ..., "panels": [...]} and join one room per
+# panel, named "<pair>:<panel>". Each tick is split into panel payloads and only
+# emitted to rooms that have subscribers, each room with its own delta stream
+# (see socket_delta). Panels:
+#   price    platform data without the holder lists
+#   holders  holder list, wallet ages and holder concentration
+#   social   X data, unique authors and their followers
+#   search   X search metrics
+# Every payload also carries the tick's timestamp, data source and staleness.
+
+HOLDER_FIELDS = (
+    "holders", "walletAgeCounts", "numHolders", "totalHolders",
+    "top10HoldersPercent", "insidersHoldPercent", "bundlersHoldPercent", "snipersHoldPercent",
+)
+COMMON_KEYS = ("timestamp", "data_source", "source_age", "stale_sources")
+
+
+def _price(result):
+    platform = result.get("platform_data") or {}
+    return {"platform_data": {k: v for k, v in platform.items() if k not in ("holders", "walletAgeCounts")}}
+
+
+def _holders(result):
+    platform = result.get("platform_data") or {}
+    return {"platform_data": {k: platform[k] for k in HOLDER_FIELDS if k in platform}}
+
+
+def _social(result):
+    return {k: result.get(k) for k in ("x_data_type", "x_data", "unique_authors", "author_followers")}
+
+
+def _search(result):
+    return {"search_metrics": result.get("search_metrics")}
+
+
+PANELS = {"price": _price, "holders": _holders, "social": _social, "search": _search}
+
+
+def room_name(pair, panel):
+    return f"{pair}:{panel}"
+
+
+def project(result, panel):
+    """The part of a tick result the `panel` room receives."""
+    payload = {k: result[k] for k in COMMON_KEYS if k in result}
+    payload.update(PANELS[panel](result))
+    return payload
+
+
+class Subscriptions:
+    """Which rooms each connected client (sid) has joined, and how many clients each room has."""
+
+    def __init__(self):
+        self._rooms = {}            # sid -> set of rooms
+        self._counts = {}           # room -> subscribers
+        self._lock = threading.Lock()
+
+    def add(self, sid, rooms):
+        with self._lock:
+            joined = self._rooms.setdefault(sid, set())
+            for room in rooms:
+                if room not in joined:
+                    joined.add(room)
+                    self._counts[room] = self._counts.get(room, 0) + 1
+
+    def remove(self, sid, rooms=None):
+        """Leave `rooms` (all of them if None); returns the rooms left."""
+        with self._lock:
+            joined = self._rooms.get(sid, set())
+            left = set(joined) if rooms is None else joined & set(rooms)
+            for room in left:
+                joined.discard(room)
+                self._counts[room] -= 1
+                if not self._counts[room]:
+                    del self._counts[room]
+            if not joined:
+                self._rooms.pop(sid, None)
+            return sorted(left)
+
+    def rooms_of(self, sid):
+        with self._lock:
+            return sorted(self._rooms.get(sid, ()))
+
+    def subscribers(self, room):
+        with self._lock:
+            return self._counts.get(room, 0)
+
+    def status(self):
+        with self._lock:
+            return {"clients": len(self._rooms), "rooms": dict(self._counts)}
@@ -0,0 +1,95 @@
+import time
+
+import eventlet
+
+# Stale-while-revalidate cache for one tick data source.
+#
+# Each tick asks the source for a value within a deadline. When the upstream
+# misses the deadline the last good value is served instead, while the slow
+# request keeps running on its green thread and refreshes the cache when it
+# finishes. At most one request per source is in flight at a time.
+
+
+class SourceCache:
+    def __init__(self, name, fetch, is_good=None):
+        self.name = name
+        self.fetch = fetch
+        self.is_good = is_good or (lambda value: bool(value))
+        self.value = None
+        self.updated_at = None
+        self.misses = 0
+        self._inflight = None
+        self.inflight_args = None   # arguments the in-flight fetch was started with
+        self._generation = 0
+
+    def _run(self, generation, *args):
+        try:
+            value = self.fetch(*args)
+        except Exception as e:
+            print(f"❌ {self.name} fetch failed: {e}")
+            return None
+        # Drop results that belong to a previous configuration (see reset)
+        if generation == self._generation and self.is_good(value):
+            self.value = value
+            self.updated_at = time.time()
+        return value
+
+    def _done(self, gt, generation):
+        if generation == self._generation and self._inflight is gt:
+            self._inflight = None
+
+    def refresh(self, *args):
+        """Start `fetch(*args)` unless a fetch is already in flight; returns the in-flight green thread.
+
+        A fetch still running from an earlier call keeps its own arguments; see `inflight_args`.
+        """
+        if self._inflight is None:
+            generation = self._generation
+            gt = eventlet.spawn(self._run, generation, *args)
+            gt.link(self._done, generation)
+            self._inflight = gt
+            self.inflight_args = args
+        return self._inflight
+
+    def get(self, gt, timeout, default):
+        """Return (value, age_seconds, fresh) for the fetch `gt`, waiting at most `timeout` seconds.
+
+        `gt` is the green thread returned by refresh() at the start of the tick.
+        `age_seconds` is None when nothing has been fetched successfully yet.
+        """
+        try:
+            with eventlet.Timeout(max(timeout, 0.01)):
+                value = gt.wait()
+            if value is not None and self.is_good(value):
+                return value, 0.0, True
+            if value is not None and self.value is None:
+                # Nothing better to serve: pass the upstream's own (empty/error) payload through
+                return value, None, True
+        except eventlet.Timeout:
+            self.misses += 1
+            print(f"⏱️ {self.name} missed its {timeout:.1f}s deadline, serving last good value")
+
+        if self.value is None:
+            return default, None, False
+        return self.value, round(time.time() - self.updated_at, 1), False
+
+    def peek(self, default):
+        """Return (value, age_seconds) of the last good value without fetching."""
+        if self.value is None:
+            return default, None
+        return self.value, round(time.time() - self.updated_at, 1)
+
+    def reset(self):
+        """Forget cached values, e.g. after the dashboard is pointed at another pair."""
+        self._generation += 1
+        self._inflight = None
+        self.inflight_args = None
+        self.value = None
+        self.updated_at = None
+
+    def status(self):
+        return {
+            "in_flight": self._inflight is not None,
+            "age_seconds": round(time.time() - self.updated_at, 1) if self.updated_at else None,
+            "deadline_misses": self.misses,
+        }
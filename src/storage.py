@@ -0,0 +1,307 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from log_index import index_for
+from segmented_log import log_for
+from timestamps import epoch
+
+# Pluggable storage for persisted ticks.
+#
+# persist_tick writes through TickStore.append() and the /api routes read
+# through tail()/range()/iter_lines(), so the backend can be swapped without
+# touching them. Two implementations:
+#   jsonl   - the segmented JSONL pair logs (default)
+#   sqlite  - one SQLite database in WAL mode, indexed on (pair, ts), with
+#             batched inserts; readers never block the writer
+# Pick one with STORAGE_BACKEND=jsonl|sqlite (SQLITE_PATH overrides the database file).
+# Both store records with heavy blobs replaced by references (see blob_store)
+# and hand back resolved records.
+
+
+class TickStore:
+    name = "base"
+    blobs = None
+
+    def encode(self, record):
+        """(stored form of a record, serialized size of the full record).
+
+        The stored form is one JSON line with heavy blobs replaced by references; the full size adds back
+        the blobs dedup already serialized, so callers never serialize the record a second time.
+        """
+        compact, saved = self.blobs.dedup(record)
+        text = json.dumps(compact, ensure_ascii=False)
+        return text, len(text) + saved
+
+    def append_batch(self, pair, items, sync=None):
+        """Persist (record, encoded) pairs in one write.
+
+        `sync(fileobj)`, if given, is called to flush and fsync what was written. Returns the location
+        (segment, start offset, end offset) of each item, or None per item if the backend has no locations.
+        Backends with locations also provide read_at(pair, locations).
+        """
+        raise NotImplementedError
+
+    def append(self, pair, record):
+        """Persist one tick. Returns (its location or None, bytes written)."""
+        text, _ = self.encode(record)
+        return self.append_batch(pair, [(record, text)])[0], len(text)
+
+    def expired(self, pair, cutoff):
+        """(batch id, records) for stored ticks older than `cutoff` (epoch seconds), oldest first.
+
+        Used by compaction; a batch is removed with drop() once it has been rolled up.
+        """
+        raise NotImplementedError
+
+    def drop(self, pair, batch_id):
+        raise NotImplementedError
+
+    def tail(self, pair, n):
+        """The last `n` records of `pair`, oldest first."""
+        raise NotImplementedError
+
+    def range(self, pair, start=None, end=None, limit=None):
+        """Records of `pair` with start <= timestamp <= end (datetimes, ISO strings or epoch seconds), oldest first."""
+        raise NotImplementedError
+
+    def count(self, pair):
+        raise NotImplementedError
+
+    def iter_lines(self, pair):
+        """Stored lines (bytes, oldest first) for a raw export; blob references are left in place."""
+        raise NotImplementedError
+
+    def pairs(self):
+        raise NotImplementedError
+
+    def status(self):
+        return {"backend": self.name}
+
+
+class JsonlStore(TickStore):
+    name = "jsonl"
+
+    def __init__(self, data_dir, blobs):
+        self.data_dir = data_dir
+        self.blobs = blobs
+
+    def _log(self, pair):
+        return log_for(self.data_dir, pair)
+
+    def _index(self, pair):
+        return index_for(self.data_dir / f"{pair}.json")
+
+    def append_batch(self, pair, items, sync=None):
+        log = self._log(pair)
+        log_index = self._index(pair)
+        locations = []
+        with open(log.active_path, "ab") as f:
+            offset = f.tell()
+            chunks = []
+            if log_index.torn:
+                # Terminate a fragment left by a crashed write so this record starts on its own line
+                chunks.append(b"\n")
+                offset += 1
+            for _, text in items:
+                data = text.encode("utf-8") + b"\n"
+                chunks.append(data)
+                locations.append((log.active_seq, offset, offset + len(data)))
+                offset += len(data)
+            f.write(b"".join(chunks))
+            if sync:
+                sync(f)
+        # Seal the active file into a compressed segment once it is large enough
+        log.maybe_rotate()
+        log_index.refresh()
+        return locations
+
+    def read_at(self, pair, locations):
+        """Records at (segment, start offset) locations returned by append_batch, in the given order."""
+        records = []
+        for line in self._log(pair).read_lines_at(locations):
+            try:
+                records.append(self.blobs.resolve(json.loads(line)))
+            except Exception:
+                continue
+        return records
+
+    def tail(self, pair, n):
+        return [self.blobs.resolve(r) for r in self._log(pair).tail(n, self._index(pair))]
+
+    def range(self, pair, start=None, end=None, limit=None):
+        records = []
+        for record in self._log(pair).records_between(epoch(start), epoch(end)):
+            records.append(self.blobs.resolve(record))
+        return records[-limit:] if limit else records
+
+    def count(self, pair):
+        return len(self._index(pair)) + self._log(pair).sealed_records()
+
+    def expired(self, pair, cutoff):
+        # Only whole sealed segments are compacted; the active file is never touched
+        log = self._log(pair)
+        for segment in log.expired_segments(cutoff):
+            records = []
+            for line in log.segment_lines(segment):
+                try:
+                    records.append(json.loads(line))
+                except Exception:
+                    continue
+            yield segment["seq"], records
+
+    def drop(self, pair, batch_id):
+        self._log(pair).drop_segment(batch_id)
+
+    def iter_lines(self, pair):
+        return self._log(pair).iter_lines()
+
+    def pairs(self):
+        return sorted(
+            p.stem for p in self.data_dir.glob("*.json")
+            if not p.name.startswith("data_") and p.stem not in ("pending", "dashboard_config") and not p.name.endswith(".agg.json")
+        )
+
+
+class SqliteStore(TickStore):
+    name = "sqlite"
+
+    def __init__(self, path, blobs, batch_size=10, flush_seconds=10.0):
+        self.path = path
+        self.blobs = blobs
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self.inserted = 0
+        self.flushes = 0
+        self._writer = self._connect()
+        self._writer.executescript("""
+            CREATE TABLE IF NOT EXISTS ticks (
+                id INTEGER PRIMARY KEY,
+                pair TEXT NOT NULL,
+                ts REAL NOT NULL,
+                record TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ticks_pair_ts ON ticks (pair, ts);
+        """)
+        self._reader = self._connect()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def flush(self):
+        with self._write_lock:
+            self._flush_locked()
+
+    def _flush_locked(self, sync=False):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        if sync:
+            # synchronous=NORMAL does not fsync WAL commits; FULL does, for this commit only
+            self._writer.execute("PRAGMA synchronous=FULL")
+        try:
+            self._writer.execute("BEGIN")
+            self._writer.executemany("INSERT INTO ticks (pair, ts, record) VALUES (?, ?, ?)", rows)
+            self._writer.execute("COMMIT")
+        finally:
+            if sync:
+                self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._last_flush = time.monotonic()
+        self.inserted += len(rows)
+        self.flushes += 1
+
+    def append_batch(self, pair, items, sync=None):
+        rows = [(pair, epoch(record.get("timestamp")) or time.time(), text) for record, text in items]
+        with self._write_lock:
+            self._pending.extend(rows)
+            # A sync request forces the commit and makes it durable (see _flush_locked)
+            if sync or len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_seconds:
+                self._flush_locked(sync=bool(sync))
+        return [None] * len(items)
+
+    def _query(self, sql, params):
+        # Rows still buffered for a batch must be visible to readers
+        self.flush()
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def _records(self, rows):
+        records = []
+        for (text,) in rows:
+            try:
+                records.append(self.blobs.resolve(json.loads(text)))
+            except Exception:
+                continue
+        return records
+
+    def tail(self, pair, n):
+        rows = self._query("SELECT record FROM ticks WHERE pair = ? ORDER BY ts DESC LIMIT ?", (pair, n))
+        return self._records(reversed(rows))
+
+    def range(self, pair, start=None, end=None, limit=None):
+        start, end = epoch(start), epoch(end)
+        sql = "SELECT record FROM ticks WHERE pair = ? AND ts >= ? AND ts <= ? ORDER BY ts DESC"
+        params = [pair, start if start is not None else float("-inf"), end if end is not None else float("inf")]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._records(reversed(self._query(sql, params)))
+
+    def count(self, pair):
+        return self._query("SELECT COUNT(*) FROM ticks WHERE pair = ?", (pair,))[0][0]
+
+    def expired(self, pair, cutoff):
+        rows = self._query("SELECT ts, record FROM ticks WHERE pair = ? AND ts < ? ORDER BY ts", (pair, cutoff))
+        if rows:
+            # The batch id is the newest expired timestamp; drop() deletes everything up to it
+            yield rows[-1][0], self._records((text,) for _, text in rows)
+
+    def drop(self, pair, batch_id):
+        with self._write_lock:
+            self._flush_locked()
+            self._writer.execute("DELETE FROM ticks WHERE pair = ? AND ts <= ?", (pair, batch_id))
+
+    def iter_lines(self, pair):
+        self.flush()
+        # A separate connection keeps a long export from holding the shared reader
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            for (text,) in conn.execute("SELECT record FROM ticks WHERE pair = ? ORDER BY ts", (pair,)):
+                yield (text + "\n").encode("utf-8")
+        finally:
+            conn.close()
+
+    def pairs(self):
+        return [p for (p,) in self._query("SELECT DISTINCT pair FROM ticks ORDER BY pair", ())]
+
+    def status(self):
+        with self._write_lock:
+            pending = len(self._pending)
+        return {
+            "backend": self.name,
+            "path": str(self.path),
+            "pending": pending,
+            "inserted": self.inserted,
+            "flushes": self.flushes,
+            "db_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+
+def open_store(data_dir, blobs, backend=None):
+    backend = (backend or os.environ.get("STORAGE_BACKEND", "jsonl")).lower()
+    if backend == "sqlite":
+        path = os.environ.get("SQLITE_PATH", str(data_dir / "ticks.db"))
+        print(f"🗄️ Tick storage: SQLite (WAL) at {path}")
+        return SqliteStore(path, blobs)
+    if backend != "jsonl":
+        print(f"⚠️ Unknown STORAGE_BACKEND '{backend}', using jsonl")
+    return JsonlStore(data_dir, blobs)
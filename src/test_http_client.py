@@ -0,0 +1,43 @@
+from unittest import mock
+
+import pytest
+
+import circuit_breaker
+import http_client
+from circuit_breaker import HALF_OPEN, CircuitOpenError, get_breaker
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    circuit_breaker._breakers.clear()
+    yield
+    circuit_breaker._breakers.clear()
+
+
+def _response(status):
+    resp = mock.Mock()
+    resp.status_code = status
+    return resp
+
+
+def test_per_account_429_releases_half_open_trial():
+    cb = get_breaker("x")
+    cb.state, cb.trial_in_flight = HALF_OPEN, False
+    session = mock.Mock()
+    session.request.return_value = _response(429)
+    with mock.patch.object(http_client, "session_for", return_value=session):
+        http_client._request_counts.setdefault("api.x.com", {"requests": 0, "coalesced": 0, "total_ms": 0.0, "last_ms": 0.0})
+        assert http_client._send("GET", "https://api.x.com/graphql", "x").status_code == 429
+        assert cb.state == HALF_OPEN and not cb.trial_in_flight
+
+        # The next call is allowed through as a fresh trial, and a 200 closes the circuit
+        session.request.return_value = _response(200)
+        http_client._send("GET", "https://api.x.com/graphql", "x")
+    assert cb.state == "closed"
+
+
+def test_half_open_trial_blocks_concurrent_calls():
+    cb = get_breaker("axiom")
+    cb.state, cb.trial_in_flight = HALF_OPEN, True
+    with pytest.raises(CircuitOpenError):
+        http_client._send("GET", "https://api.axiom.trade/x", "axiom")
@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+
+# Asynchronous group-commit writer for tick persistence.
+#
+# The tick publisher only enqueues (never blocks; a full queue drops the tick
+# and counts it). A single worker drains whatever has queued up, at most
+# max_batch items, and hands the batch to `handler(batch, sync)`, which writes it
+# in one go and returns how many items it could not persist (None for none; an
+# exception fails the whole batch). `sync` tells the handler to fsync, according
+# to the policy:
+#   none      never fsync; the OS flushes when it likes
+#   interval  fsync at most once per fsync_interval seconds (default)
+#   always    fsync every batch
+
+FSYNC_POLICIES = ("none", "interval", "always")
+
+
+class GroupCommitWriter:
+    def __init__(self, handler, max_queue=256, max_batch=32, fsync_policy="interval", fsync_interval=1.0):
+        if fsync_policy not in FSYNC_POLICIES:
+            print(f"⚠️ Unknown fsync policy '{fsync_policy}', using 'interval'")
+            fsync_policy = "interval"
+        self.handler = handler
+        self.max_batch = max_batch
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.dropped = 0
+        self.batches = 0
+        self.written = 0
+        self.failed = 0
+        self.fsyncs = 0
+        self.max_depth = 0
+        self.last_batch_ms = 0.0
+        self.max_batch_ms = 0.0
+        self.total_batch_ms = 0.0
+        self.last_lag_ms = 0.0          # enqueue -> written, for the newest item of the last batch
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, item):
+        """Queue `item` for the next batch; returns False (and drops it) if the queue is full."""
+        try:
+            self._queue.put_nowait((time.monotonic(), item))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            print("⚠️ Tick writer queue full, dropping a tick")
+            return False
+        with self._lock:
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def _should_sync(self):
+        if self.fsync_policy == "always":
+            return True
+        if self.fsync_policy == "interval":
+            return time.monotonic() - self._last_sync >= self.fsync_interval
+        return False
+
+    def _run(self):
+        while True:
+            entries = [self._queue.get()]
+            while len(entries) < self.max_batch:
+                try:
+                    entries.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            sync = self._should_sync()
+            started = time.monotonic()
+            try:
+                failed = self.handler([item for _, item in entries], sync) or 0
+            except Exception as e:
+                print(f"❌ Tick writer batch of {len(entries)} failed: {e}")
+                failed = len(entries)
+            ok = failed < len(entries)
+            finished = time.monotonic()
+            elapsed_ms = (finished - started) * 1000
+            with self._lock:
+                self.batches += 1
+                self.written += len(entries) - failed
+                self.failed += failed
+                if sync and ok:
+                    self.fsyncs += 1
+                    self._last_sync = finished
+                self.last_batch_ms = elapsed_ms
+                self.max_batch_ms = max(self.max_batch_ms, elapsed_ms)
+                self.total_batch_ms += elapsed_ms
+                self.last_lag_ms = (finished - entries[-1][0]) * 1000
+            for _ in entries:
+                self._queue.task_done()
+
+    def join(self):
+        """Block until everything queued so far has been handled."""
+        self._queue.join()
+
+    def status(self):
+        with self._lock:
+            return {
+                "fsync_policy": self.fsync_policy,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_depth,
+                "queue_capacity": self._queue.maxsize,
+                "submitted": self.submitted,
+                "dropped": self.dropped,
+                "written": self.written,
+                "failed": self.failed,
+                "batches": self.batches,
+                "avg_batch_size": round(self.written / self.batches, 2) if self.batches else 0,
+                "fsyncs": self.fsyncs,
+                "last_batch_ms": round(self.last_batch_ms, 2),
+                "avg_batch_ms": round(self.total_batch_ms / self.batches, 2) if self.batches else 0,
+                "max_batch_ms": round(self.max_batch_ms, 2),
+                "last_lag_ms": round(self.last_lag_ms, 2),
+            }
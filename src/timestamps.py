@@ -0,0 +1,41 @@
+import json
+from datetime import datetime
+
+# Timestamp parsing shared by the stores, logs, indexes and compaction.
+#
+# Records carry ISO timestamps (naive ones are local time, a trailing "Z" means
+# UTC); query bounds may also be datetimes or epoch seconds, as numbers or
+# numeric strings. Everything is compared as epoch seconds.
+
+
+def epoch(value):
+    """Epoch seconds of a datetime, ISO string or epoch number/string; None stays None. Raises ValueError on bad input."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+def record_epoch(record):
+    """Epoch seconds of a record's timestamp, or None if it has no usable one."""
+    try:
+        return epoch(record["timestamp"])
+    except Exception:
+        return None
+
+
+def line_epoch(line):
+    """Epoch seconds of the timestamp of a JSON record line, or None if the line is not a valid record."""
+    try:
+        return record_epoch(json.loads(line))
+    except Exception:
+        return None
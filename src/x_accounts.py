@@ -0,0 +1,115 @@
+import json
+import os
+import pathlib
+import threading
+import time
+
+# Pool of X accounts used for GraphQL calls.
+#
+# Each X endpoint grants one rate-limit window per account, so spreading
+# requests over several accounts raises the ceiling on how many tokens can be
+# watched. Every request is routed to the healthy account with the most
+# headroom on that endpoint; accounts answering 401/403 are quarantined.
+#
+# Accounts are read from the JSON file named by X_ACCOUNTS_FILE (default:
+# x_accounts.json next to this module), a list of
+#     {"name": "...", "auth_token": "...", "ct0": "...", "twid": "..."}
+# Without that file the pool holds the single built-in account below.
+
+DEFAULT_AUTH_TOKEN = "84c79d35cb2a902f89168422691d42a685e810cb"
+DEFAULT_CT0 = "61f38a6545d11663e819f9f141229a157b4da9742e66762cb54e799b149de7d6ea6d327683a4ab7d5a59ee4f8841dd5395e95aaeefdca7847794a5df46ecb2a24c88a47849d6ef6e4f41e2c110e06232"
+DEFAULT_TWID = "u%3D1919992237397835776"
+
+ACCOUNTS_FILE = pathlib.Path(os.environ.get("X_ACCOUNTS_FILE", pathlib.Path(__file__).parent / "x_accounts.json"))
+QUARANTINE_SECONDS = 15 * 60
+
+
+class XAccount:
+    def __init__(self, name, auth_token, ct0, twid=None):
+        self.name = name
+        self.auth_token = auth_token
+        self.ct0 = ct0
+        self.twid = twid
+        self.quarantined_until = 0.0
+        self.auth_failures = 0
+        self.requests = 0
+        self.last_status = None
+
+    def is_healthy(self):
+        return time.time() >= self.quarantined_until
+
+    def cookies(self):
+        cookies = {"auth_token": self.auth_token, "ct0": self.ct0}
+        if self.twid:
+            cookies["twid"] = self.twid
+        return cookies
+
+
+class XCredentialPool:
+    def __init__(self, accounts, limiter):
+        self.accounts = list(accounts)
+        self.limiter = limiter
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bucket_key(account, operation):
+        return f"{account.name}/{operation}"
+
+    def acquire(self, operation):
+        """Pick the healthy account with the most headroom on `operation` and take a permit.
+
+        Returns None when no account has a permit; the caller should serve cached data.
+        """
+        with self._lock:
+            healthy = [a for a in self.accounts if a.is_healthy()]
+        ranked = sorted(
+            healthy,
+            key=lambda a: self.limiter.headroom(self.bucket_key(a, operation)),
+            reverse=True,
+        )
+        for account in ranked:
+            if self.limiter.try_acquire(self.bucket_key(account, operation)):
+                account.requests += 1
+                return account
+        return None
+
+    def report(self, account, operation, resp):
+        """Record an X response: feed its rate-limit headers and quarantine rejected credentials."""
+        self.limiter.update_from_response(self.bucket_key(account, operation), resp)
+        with self._lock:
+            account.last_status = resp.status_code
+            if resp.status_code in (401, 403):
+                account.auth_failures += 1
+                account.quarantined_until = time.time() + QUARANTINE_SECONDS
+                print(f"🚫 X account '{account.name}' got HTTP {resp.status_code}, quarantined for {QUARANTINE_SECONDS // 60} min")
+
+    def status(self):
+        now = time.time()
+        with self._lock:
+            return {
+                a.name: {
+                    "healthy": a.is_healthy(),
+                    "quarantined_for_seconds": round(max(a.quarantined_until - now, 0), 1),
+                    "auth_failures": a.auth_failures,
+                    "requests": a.requests,
+                    "last_status": a.last_status,
+                }
+                for a in self.accounts
+            }
+
+
+def load_accounts(path=ACCOUNTS_FILE):
+    try:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            accounts = [
+                XAccount(e.get("name") or f"account{i}", e["auth_token"], e["ct0"], e.get("twid"))
+                for i, e in enumerate(entries)
+            ]
+            if accounts:
+                print(f"✅ Loaded {len(accounts)} X accounts from {path}")
+                return accounts
+    except Exception as e:
+        print(f"❌ Error loading X accounts from {path}: {e}")
+    return [XAccount("default", DEFAULT_AUTH_TOKEN, DEFAULT_CT0, DEFAULT_TWID)]
@@ -0,0 +1,43 @@
+import os
+
+import http_client
+from rate_limiter import RateLimitedError, x_rate_limiter
+from singleflight import SingleFlight
+from x_accounts import XCredentialPool, load_accounts
+
+# Single entry point for X GraphQL calls: pooled connection, "x" circuit
+# breaker, the shared non-blocking rate limiter and account rotation.
+
+# Point X traffic at a local stand-in (see x_standin.py), e.g. http://127.0.0.1:5055
+X_API_BASE = os.environ.get("X_API_BASE")
+
+x_pool = XCredentialPool(load_accounts(), x_rate_limiter)
+x_flight = SingleFlight()
+
+
+def x_get(url, **kwargs):
+    """GET an X endpoint with the account that has the most headroom.
+
+    Identical requests already in flight share one call (and one permit).
+    Raises RateLimitedError at once when no account has a permit left.
+    """
+    resp, _ = x_flight.do(http_client.flight_key("GET", url, kwargs.get("params")), _x_get, url, **kwargs)
+    return resp
+
+
+def _x_get(url, headers=None, cookies=None, **kwargs):
+    operation = x_rate_limiter.key_for(url)
+    account = x_pool.acquire(operation)
+    if account is None:
+        raise RateLimitedError(f"X {operation} rate budget spent on every account")
+
+    # The account supplies auth; drop any hard-coded cookie header so its cookies apply
+    headers = {k: v for k, v in (headers or {}).items() if k.lower() != "cookie"}
+    headers["x-csrf-token"] = account.ct0
+    cookies = {**(cookies or {}), **account.cookies()}
+
+    if X_API_BASE and url.startswith("https://x.com"):
+        url = X_API_BASE.rstrip("/") + url[len("https://x.com"):]
+    resp = http_client.get(url, breaker="x", headers=headers, cookies=cookies, **kwargs)
+    x_pool.report(account, operation, resp)
+    return resp
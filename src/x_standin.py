@@ -0,0 +1,46 @@
+import os
+import time
+
+from flask import Flask, jsonify, request
+
+# Local stand-in for the X GraphQL API that enforces fake per-account quotas.
+#
+# Used to exercise the account pool and rate limiter without touching x.com:
+#     python x_standin.py
+#     X_API_BASE=http://127.0.0.1:5055 X_ACCOUNTS_FILE=... python backend.py
+# Every auth_token gets X_STANDIN_QUOTA calls per operation per X_STANDIN_WINDOW
+# seconds; tokens listed in X_STANDIN_REVOKED (comma separated) get HTTP 401.
+
+QUOTA = int(os.environ.get("X_STANDIN_QUOTA", 5))
+WINDOW = int(os.environ.get("X_STANDIN_WINDOW", 60))
+REVOKED = set(filter(None, os.environ.get("X_STANDIN_REVOKED", "").split(",")))
+
+app = Flask(__name__)
+windows = {}  # (auth_token, operation) -> (reset_at, used)
+
+
+@app.route("/i/api/graphql/<query_id>/<operation>")
+def graphql(query_id, operation):
+    token = request.cookies.get("auth_token")
+    if not token or token in REVOKED:
+        return jsonify({"errors": [{"message": "Could not authenticate you"}]}), 401
+
+    now = int(time.time())
+    reset_at, used = windows.get((token, operation), (now + WINDOW, 0))
+    if now >= reset_at:
+        reset_at, used = now + WINDOW, 0
+    used += 1
+    windows[(token, operation)] = (reset_at, used)
+
+    headers = {
+        "x-rate-limit-limit": str(QUOTA),
+        "x-rate-limit-remaining": str(max(QUOTA - used, 0)),
+        "x-rate-limit-reset": str(reset_at),
+    }
+    if used > QUOTA:
+        return jsonify({"errors": [{"message": "Rate limit exceeded"}]}), 429, headers
+    return jsonify({"data": {}, "standin": {"operation": operation, "account": token}}), 200, headers
+
+
+if __name__ == "__main__":
+    app.run(host="127.0.0.1", port=int(os.environ.get("X_STANDIN_PORT", 5055)))